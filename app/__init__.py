@@ -1,8 +1,10 @@
-from flask import Flask, render_template, redirect, url_for
+from flask import Flask, render_template, redirect, url_for, request, abort
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
 import os
+import posixpath
+from datetime import datetime, timedelta
 
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -14,28 +16,56 @@ def create_app():
     from app.config import Config
     app.config.from_object(Config)
     
+    from app.utils.engine import engine_options, configure_engine
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)
+    with app.app_context():
+        configure_engine(db.engine, app.config)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     mail.init_app(app)
     
-    from app.models import User
+    from app.utils.user_cache import load_session_user
+    from app.commands import register_commands
+    from app.utils.timing import init_timing
+    
+    from app.utils.metrics import init_metrics
+    from app.utils.email_queue import init_email_queue
+    
+    # First, so the request timers start before the other hooks run
+    init_timing(app)
+    init_metrics(app)
+    init_email_queue(app)
     
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return load_session_user(int(user_id))
     
     from app.routes.auth import auth_bp
     from app.routes.jobs import jobs_bp
     from app.routes.applications import applications_bp
     from app.routes.interviews import interviews_bp
     from app.routes.profile import profile_bp
+    from app.routes.api import api_bp
+    from app.routes.monitoring import monitoring_bp
+    from app.routes.notifications import notifications_bp
     
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(jobs_bp, url_prefix='/jobs')
     app.register_blueprint(applications_bp, url_prefix='/applications')
     app.register_blueprint(interviews_bp, url_prefix='/interviews')
     app.register_blueprint(profile_bp, url_prefix='/profile')
+    app.register_blueprint(api_bp, url_prefix='/api/v1')
+    app.register_blueprint(monitoring_bp)
+    app.register_blueprint(notifications_bp, url_prefix='/notifications')
+    
+    @app.before_request
+    def protect_uploads():
+        # Resumes live under static/ but are only served through the authenticated download views
+        if request.endpoint == 'static':
+            filename = posixpath.normpath((request.view_args or {}).get('filename', ''))
+            if filename.lstrip('/').startswith('uploads/'):
+                abort(404)
     
     @app.route('/')
     def index():
@@ -47,28 +77,18 @@ def create_app():
                 return redirect(url_for('jobs.employee_dashboard'))
         return redirect(url_for('auth.login'))
     
+    # Interview templates compute dates inline
+    app.jinja_env.globals.update(datetime=datetime, timedelta=timedelta)
+    
     @app.template_filter('nl2br')
     def nl2br_filter(text):
         if text is None:
             return ''
         return text.replace('\n', '<br>\n')
     
-    with app.app_context():
-        db.create_all()
-        admin = User.query.filter_by(email='admin@talentbridge.com').first()
-        if not admin:
-            from werkzeug.security import generate_password_hash
-            admin = User(
-                username='admin',
-                email='admin@talentbridge.com',
-                password=generate_password_hash('admin123'),
-                role='hr',
-                first_name='Admin',
-                last_name='User',
-                department='HR'
-            )
-            db.session.add(admin)
-            db.session.commit()
+    # No database I/O here: tables, indexes and the first admin account are
+    # created by `flask init-db`, so workers start fast and never race on DDL
+    register_commands(app)
     
     @app.errorhandler(404)
     def not_found_error(error):
@@ -0,0 +1,295 @@
+import click
+from flask.cli import AppGroup
+from app import db
+
+db_cli = AppGroup('db', help='Manage the database schema.')
+search_cli = AppGroup('search', help='Manage the job full-text search index.')
+outbox_cli = AppGroup('outbox', help='Inspect and drain the outbound email queue.')
+skills_cli = AppGroup('skills', help='Manage candidate and job skill vectors.')
+import_cli = AppGroup('import', help='Bulk-load jobs, users and applications from CSV or JSON.')
+bench_cli = AppGroup('bench', help='Seed a synthetic dataset and benchmark the busiest pages.')
+
+
+def _check_duplicates():
+    from sqlalchemy import inspect
+    from app.utils.schema import duplicate_applications
+
+    with db.engine.connect() as connection:
+        if not inspect(connection).has_table('application'):
+            return
+        duplicates = duplicate_applications(connection)
+    if duplicates:
+        for job_id, user_id, count in duplicates:
+            click.echo(f'User {user_id} has {count} applications for job {job_id}', err=True)
+        raise click.ClickException(
+            'Resolve duplicate applications before adding the unique (job_id, user_id) index.'
+        )
+
+
+@db_cli.command('upgrade')
+def upgrade_db():
+    """Create missing tables and indexes on an existing database."""
+    from app.utils.schema import upgrade_schema
+    from app.utils.search import search_index_ready, rebuild_search_index
+
+    _check_duplicates()
+    with db.engine.begin() as connection:
+        created = upgrade_schema(connection)
+        if not search_index_ready(connection):
+            rebuild_search_index(connection)
+
+    for name in created:
+        click.echo(f'Created index {name}')
+    click.echo('Database is up to date.')
+
+
+@click.command('init-db')
+@click.option('--admin-email', default='admin@talentbridge.com', show_default=True,
+              help='Email of the HR account created if it does not exist.')
+@click.option('--admin-password', envvar='ADMIN_PASSWORD', default='admin123',
+              help='Password for a newly created admin account (or $ADMIN_PASSWORD).')
+def init_db(admin_email, admin_password):
+    """Create the schema, search index and first admin account; safe to re-run on every deploy."""
+    from app.utils.schema import init_database
+
+    _check_duplicates()
+    created, admin_created = init_database(admin_email, admin_password)
+    for name in created:
+        click.echo(f'Created index {name}')
+    if admin_created:
+        click.echo(f'Created admin account {admin_email}')
+    click.echo('Database is ready.')
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """Create the job search index if needed and backfill it from the job table."""
+    from app.utils.search import rebuild_search_index
+
+    with db.engine.begin() as connection:
+        indexed = rebuild_search_index(connection)
+    if indexed is None:
+        click.echo(f'Full-text search is not supported on {db.engine.dialect.name}; using ILIKE fallback.')
+    else:
+        click.echo(f'Indexed {indexed} jobs.')
+
+
+@outbox_cli.command('status')
+def outbox_status():
+    """Show the number of queued emails per status."""
+    from app.utils.email_queue import queue_depth
+
+    depth = queue_depth()
+    for status in ('pending', 'sending', 'sent', 'dead'):
+        click.echo(f'{status}: {depth.get(status, 0)}')
+
+
+@outbox_cli.command('drain')
+def outbox_drain():
+    """Send every email that is currently due, then exit."""
+    from app.utils.email_queue import drain_outbox
+
+    total = 0
+    while True:
+        claimed = drain_outbox()
+        total += claimed
+        if not claimed:
+            break
+    click.echo(f'Processed {total} emails.')
+
+
+@outbox_cli.command('work')
+@click.option('--interval', default=5.0, help='Seconds to wait when the queue is empty.')
+def outbox_work(interval):
+    """Run a long-lived worker that drains the outbox."""
+    import time
+    from app.utils.email_queue import drain_outbox
+
+    click.echo('Outbox worker started.')
+    while True:
+        try:
+            claimed = drain_outbox()
+        except Exception as e:
+            db.session.rollback()
+            click.echo(f'Error draining outbox: {e}', err=True)
+            claimed = 0
+        if not claimed:
+            time.sleep(interval)
+
+
+@outbox_cli.command('requeue-dead')
+def outbox_requeue_dead():
+    """Retry emails that exhausted their delivery attempts."""
+    from app.utils.email_queue import requeue_dead
+
+    click.echo(f'Requeued {requeue_dead()} emails.')
+
+
+@skills_cli.command('rebuild')
+@click.option('--force', is_flag=True, help='Re-extract resumes even if nothing changed.')
+def rebuild_skills(force):
+    """Recompute skill vectors for every job and candidate."""
+    from app.utils.skills import rebuild_all_vectors
+
+    jobs, candidates = rebuild_all_vectors(force=force)
+    click.echo(f'Processed {jobs} jobs and {candidates} candidates.')
+
+
+def _progress(report):
+    click.echo(f'{report.read} rows read, {report.inserted} inserted, '
+               f'{len(report.skipped)} skipped ({report.rate:.0f} rows/s)')
+
+
+def _finish(report, what):
+    for line, reason in report.skipped[:20]:
+        click.echo(f"  skipped{f' line {line}' if line else ''}: {reason}", err=True)
+    if len(report.skipped) > 20:
+        click.echo(f'  ... and {len(report.skipped) - 20} more', err=True)
+    click.echo(f'Imported {report.inserted} {what}, skipped {len(report.skipped)} ({report.rate:.0f} rows/s).')
+
+
+@import_cli.command('jobs')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--posted-by', default='admin@talentbridge.com', show_default=True,
+              help='Email of the HR user recorded as the poster.')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per INSERT and commit.')
+def import_jobs_command(path, posted_by, batch_size):
+    """Import jobs (title, department, location, description, ...)."""
+    from app.models import User
+    from app.utils.importer import ImportReport, import_jobs, invalidate_caches, read_records
+    from app.utils.search import rebuild_search_index
+
+    poster = User.query.filter_by(email=posted_by).first()
+    if poster is None:
+        raise click.ClickException(f'No user with email {posted_by}')
+    report = import_jobs(read_records(path), poster.id, batch_size=batch_size, report=ImportReport(_progress))
+    invalidate_caches()
+    if report.inserted:
+        with db.engine.begin() as connection:
+            rebuild_search_index(connection)
+        click.echo("Rebuilt the search index. Run 'flask skills rebuild' to score the new jobs.")
+    _finish(report, 'jobs')
+
+
+@import_cli.command('users')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per INSERT and commit.')
+@click.option('--workers', type=int, default=None, help='Password hashing processes (default: CPU count).')
+def import_users_command(path, batch_size, workers):
+    """Import users (email, first_name, last_name, password or password_hash, ...)."""
+    from app.utils.importer import ImportReport, import_users, invalidate_caches, read_records
+
+    report = import_users(read_records(path), batch_size=batch_size, workers=workers,
+                          report=ImportReport(_progress))
+    invalidate_caches()
+    _finish(report, 'users')
+
+
+@import_cli.command('applications')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per INSERT and commit.')
+def import_applications_command(path, batch_size):
+    """Import applications (email or user_id, job_id, status, applied_at, cover_letter)."""
+    from app.utils.importer import ImportReport, import_applications, invalidate_caches, read_records
+
+    report = import_applications(read_records(path), batch_size=batch_size, report=ImportReport(_progress))
+    invalidate_caches()
+    _finish(report, 'applications')
+
+
+@bench_cli.command('seed')
+@click.option('--users', default=1000, show_default=True)
+@click.option('--jobs', default=500, show_default=True)
+@click.option('--applications', default=10000, show_default=True)
+@click.option('--interviews', default=2000, show_default=True)
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed gives the same data.')
+@click.option('--reset', is_flag=True, help='Drop and recreate every table first.')
+def bench_seed(users, jobs, applications, interviews, seed, reset):
+    """Fill the database with synthetic users, jobs, applications and interviews."""
+    from app.models import User
+    from app.utils.benchmark import HR_EMAIL, seed_dataset
+
+    if reset:
+        click.confirm(f'Drop every table in {db.engine.url.render_as_string()}?', abort=True)
+        db.drop_all()
+        db.create_all()
+    elif User.query.filter_by(email=HR_EMAIL).first():
+        raise click.ClickException('Benchmark data is already loaded; use --reset to start over.')
+
+    counts = seed_dataset(users=users, jobs=jobs, applications=applications, interviews=interviews, seed=seed)
+    click.echo(', '.join(f'{count} {table}' for table, count in counts.items()) + ' inserted.')
+
+
+@bench_cli.command('run')
+@click.option('--iterations', default=50, show_default=True, help='Timed requests per scenario.')
+@click.option('--warmup', default=5, show_default=True, help='Untimed requests per scenario.')
+@click.option('--scenario', 'scenarios', multiple=True,
+              help='Run only this scenario (repeatable): job_list, manage_applications, '
+                   'hr_dashboard, interview_list, apply.')
+@click.option('--label', help='Free-form tag stored in the report, e.g. a release or commit.')
+@click.option('--output', type=click.Path(dir_okay=False), help='Write the JSON report to this file.')
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False),
+              help='Earlier report to compare against; exits 1 on a regression.')
+@click.option('--tolerance', default=0.2, show_default=True, help='Allowed p95 slowdown as a fraction.')
+def bench_run(iterations, warmup, scenarios, label, output, baseline, tolerance):
+    """Measure latency percentiles and SQL query counts for the busiest pages."""
+    import json
+    from flask import current_app
+    from app.utils.benchmark import compare_reports, run_benchmark
+
+    report = run_benchmark(current_app._get_current_object(), iterations=iterations, warmup=warmup,
+                           scenarios=scenarios, label=label)
+    click.echo(f"{'scenario':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'errors':>8}")
+    for name, result in report['scenarios'].items():
+        click.echo(f"{name:<22}{result['p50_ms'] or 0:>9.1f}{result['p95_ms'] or 0:>9.1f}"
+                   f"{result['p99_ms'] or 0:>9.1f}{result['queries_max'] or 0:>9}{result['errors']:>8}")
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        click.echo(f'Report written to {output}')
+    if baseline:
+        with open(baseline) as f:
+            lines, regressed = compare_reports(json.load(f), report, tolerance)
+        for line in lines:
+            click.echo(line)
+        if regressed:
+            raise SystemExit(1)
+
+
+@bench_cli.command('writes')
+@click.option('--processes', default=4, show_default=True, help='Concurrent writer processes.')
+@click.option('--transactions', default=200, show_default=True, help='Commits per process.')
+def bench_writes(processes, transactions):
+    """Commit small writes from several processes at once and report lock failures."""
+    from app.utils.benchmark import hammer_writes
+
+    click.echo(f'{processes} processes x {transactions} commits against {db.engine.dialect.name}...')
+    result = hammer_writes(processes=processes, transactions=transactions)
+    click.echo(f"{result['commits']} commits, {result['failures']} failed, "
+               f"{result['commits_per_second']} commits/s; p50 {result['p50_ms'] or 0:.1f} ms, "
+               f"p95 {result['p95_ms'] or 0:.1f} ms, p99 {result['p99_ms'] or 0:.1f} ms")
+    for message in result['failure_messages']:
+        click.echo(f'  {message}', err=True)
+    if result['failures']:
+        raise SystemExit(1)
+
+
+@bench_cli.command('startup')
+@click.option('--runs', default=5, show_default=True, help='Fresh interpreters to time.')
+def bench_startup(runs):
+    """Time importing the app and running create_app() in a fresh process."""
+    from app.utils.benchmark import measure_startup
+
+    result = measure_startup(runs)
+    click.echo(f"import {result['import_ms']:.0f} ms, create_app {result['factory_ms']:.0f} ms "
+               f"(median of {result['runs']}), {result['connections']} database connections during start-up")
+
+
+def register_commands(app):
+    app.cli.add_command(init_db)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(skills_cli)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(bench_cli)
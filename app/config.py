@@ -1,20 +1,81 @@
 import os
 from dotenv import load_dotenv
+from app.utils.engine import database_uri
 
 load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///talentbridge.db'
+    SQLALCHEMY_DATABASE_URI = database_uri(os.environ.get('DATABASE_URL') or 'sqlite:///talentbridge.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool for Postgres/MySQL, per worker process
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # SQLite pragmas applied on every connection (WAL journaling is always on)
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'app/static/uploads/resumes'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
     
+    # Resume downloads: unset to stream from Python, or 'x-sendfile' (Apache/lighttpd)
+    # / 'x-accel-redirect' (nginx internal location at RESUME_ACCEL_REDIRECT_PREFIX)
+    RESUME_SENDFILE = os.environ.get('RESUME_SENDFILE')
+    RESUME_ACCEL_REDIRECT_PREFIX = os.environ.get('RESUME_ACCEL_REDIRECT_PREFIX', '/protected/resumes/')
+    # Seconds a logged-in user's id/role/name stay cached between requests (0 disables).
+    # The cache is per process: a commit drops the entry only in the process that made it,
+    # so a role change or account deletion made by another worker, a script or directly
+    # in the database is seen for up to this long. Set it to 0 to check on every request.
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    # Browser cache lifetime for resume URLs that name the stored file (other resume URLs revalidate)
+    RESUME_CACHE_MAX_AGE = int(os.environ.get('RESUME_CACHE_MAX_AGE', 365 * 24 * 3600))
+    
+    # Server-Timing response header with db/template/email time per request
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', 'true').lower() in ['true', '1']
+    # Statements slower than this (ms) are logged with their endpoint (0 disables)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 250))
+    
+    # Shared directory where each worker process publishes its metrics for /metrics to merge
+    # (clear it on deploy); unset for single-process servers
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+    # Require "Authorization: Bearer <token>" on /metrics when set
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    
+    # Unread-notification badge updates: 'poll' has the browser fetch the cached count
+    # every minute. 'sse' streams them, holding a worker for each open tab; only enable
+    # it when /notifications/stream is served by async (gevent/eventlet) workers
+    NOTIFICATION_STREAM = os.environ.get('NOTIFICATION_STREAM', 'poll')
+    NOTIFICATION_STREAM_INTERVAL = float(os.environ.get('NOTIFICATION_STREAM_INTERVAL', 5))
+    NOTIFICATION_STREAM_TIMEOUT = int(os.environ.get('NOTIFICATION_STREAM_TIMEOUT', 55))
+    # Open streams per process; beyond this, browsers fall back to polling
+    NOTIFICATION_STREAM_LIMIT = int(os.environ.get('NOTIFICATION_STREAM_LIMIT', 100))
+    
+    # Listings larger than this switch from page numbers to cursor pagination
+    KEYSET_PAGINATION_THRESHOLD = int(os.environ.get('KEYSET_PAGINATION_THRESHOLD', 1000))
+    
+    # Resume/skills pipeline: 'thread' refreshes skill vectors in the background,
+    # 'none' leaves it to `flask skills rebuild`
+    SKILLS_PIPELINE = os.environ.get('SKILLS_PIPELINE', 'thread')
+    SKILL_RANK_LIMIT = int(os.environ.get('SKILL_RANK_LIMIT', 50))
+    
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    
+    # Outbound email queue: 'thread' drains it inside each web process,
+    # 'none' leaves it to a separate `flask outbox work` process
+    EMAIL_QUEUE_WORKER = os.environ.get('EMAIL_QUEUE_WORKER', 'thread')
+    EMAIL_QUEUE_BATCH_SIZE = int(os.environ.get('EMAIL_QUEUE_BATCH_SIZE', 50))
+    EMAIL_QUEUE_POLL_INTERVAL = float(os.environ.get('EMAIL_QUEUE_POLL_INTERVAL', 5))
+    EMAIL_QUEUE_LOCK_TIMEOUT = int(os.environ.get('EMAIL_QUEUE_LOCK_TIMEOUT', 300))
+    EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 5))
+    EMAIL_RETRY_BACKOFF = int(os.environ.get('EMAIL_RETRY_BACKOFF', 30))
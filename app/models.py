@@ -33,6 +33,11 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 class Job(db.Model):
+    __table_args__ = (
+        # employee_dashboard / job_list: active jobs, newest first
+        db.Index('ix_job_status_created_at', 'status', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     department = db.Column(db.String(100), nullable=False)
@@ -54,7 +59,20 @@ class Job(db.Model):
     def __repr__(self):
         return f'<Job {self.title}>'
 
+APPLICATION_STATUSES = ('submitted', 'screening', 'interview', 'offer', 'rejected', 'withdrawn')
+
 class Application(db.Model):
+    __table_args__ = (
+        # One application per candidate per job; also serves apply/job_detail lookups
+        db.Index('uq_application_job_user', 'job_id', 'user_id', unique=True),
+        # my_applications / employee_dashboard
+        db.Index('ix_application_user_applied_at', 'user_id', 'applied_at'),
+        # manage_applications filtered by status
+        db.Index('ix_application_status_applied_at', 'status', 'applied_at'),
+        # manage_applications unfiltered / hr_dashboard recent applications
+        db.Index('ix_application_applied_at', 'applied_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -73,6 +91,17 @@ class Application(db.Model):
         return f'<Application {self.id}>'
 
 class Interview(db.Model):
+    __table_args__ = (
+        # interview_list filtered by status
+        db.Index('ix_interview_status_scheduled_date', 'status', 'scheduled_date'),
+        # interview_list unfiltered, ordered by date
+        db.Index('ix_interview_scheduled_date', 'scheduled_date'),
+        # my_interviews join and application cascade
+        db.Index('ix_interview_application_id', 'application_id'),
+        # Conflict checks and free-slot search per interviewer
+        db.Index('ix_interview_interviewer_scheduled_date', 'interviewer_email', 'scheduled_date'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
     
@@ -91,6 +120,11 @@ class Interview(db.Model):
         return f'<Interview {self.id}>'
 
 class Notification(db.Model):
+    __table_args__ = (
+        # Unread counts per user are an index-only range scan
+        db.Index('ix_notification_user_read_created_at', 'user_id', 'is_read', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     title = db.Column(db.String(200), nullable=False)
@@ -102,3 +136,88 @@ class Notification(db.Model):
     
     def __repr__(self):
         return f'<Notification {self.title}>'
+
+class OutboundEmail(db.Model):
+    __tablename__ = 'outbound_email'
+    __table_args__ = (
+        # Outbox worker: next due messages
+        db.Index('ix_outbound_email_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    recipients = db.Column(db.Text, nullable=False)
+    subject = db.Column(db.String(300), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    sender = db.Column(db.String(120))
+    
+    # pending -> sending -> sent, or back to pending for a retry, or dead after too many failures
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    locked_by = db.Column(db.String(64))
+    locked_at = db.Column(db.DateTime)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    
+    attachments = db.relationship('OutboundEmailAttachment', lazy=True, cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<OutboundEmail {self.id} {self.status}>'
+
+class OutboundEmailAttachment(db.Model):
+    __tablename__ = 'outbound_email_attachment'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    email_id = db.Column(db.Integer, db.ForeignKey('outbound_email.id'), nullable=False, index=True)
+    filename = db.Column(db.String(200), nullable=False)
+    content_type = db.Column(db.String(100), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    
+    def __repr__(self):
+        return f'<OutboundEmailAttachment {self.filename}>'
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+class SkillVector(db.Model):
+    __tablename__ = 'skill_vector'
+    __table_args__ = (
+        db.Index('uq_skill_vector_kind_owner', 'kind', 'owner_id', unique=True),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # 'user' (candidate profile + resumes) or 'job' (skills_required)
+    kind = db.Column(db.String(10), nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+    
+    # Packed int32 skill ids (ascending) and matching float32 weights
+    skill_ids = db.Column(db.LargeBinary, nullable=False)
+    weights = db.Column(db.LargeBinary, nullable=False)
+    source_hash = db.Column(db.String(64))
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SkillVector {self.kind} {self.owner_id}>'
+
+class StoredFile(db.Model):
+    __tablename__ = 'stored_file'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Content-addressed: identical uploads share one file on disk
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    filename = db.Column(db.String(200), unique=True, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    # Number of profile/application rows referencing this file
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<StoredFile {self.filename} refs={self.ref_count}>'
@@ -0,0 +1,205 @@
+from datetime import date, datetime
+from flask import Blueprint, request, jsonify
+from flask_login import current_user
+from app import db
+from app.models import Job, Application, Interview, User
+from app.utils.search import apply_search
+from app.utils.pagination import keyset_paginate
+
+api_bp = Blueprint('api', __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+_full_name = (User.first_name + ' ' + User.last_name)
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class Resource:
+    """Fields a client may select for one resource, as {name: (column, join)}.
+
+    `join` names the extra table a field needs, so a request only joins
+    what its selected fields use. The id and sort columns are always
+    selected because cursors are built from them.
+    """
+
+    def __init__(self, id_column, sort_column, fields, default_fields, restricted=()):
+        self.id_column = id_column
+        self.sort_column = sort_column
+        self.fields = fields
+        self.default_fields = default_fields
+        self.restricted = set(restricted)
+
+    def select(self, requested):
+        """Return (names, columns, joins) for the requested field list."""
+        if requested:
+            names = list(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+        else:
+            names = list(self.default_fields)
+        unknown = [name for name in names if name not in self.fields]
+        if current_user.role not in ['hr', 'manager']:
+            unknown += [name for name in names if name in self.restricted]
+        if unknown:
+            raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+        selected = list(dict.fromkeys([self.id_column.key, self.sort_column.key] + names))
+        columns = [self.fields[name][0].label(name) for name in selected]
+        joins = {self.fields[name][1] for name in selected} - {None}
+        return names, columns, joins
+
+
+JOB_FIELDS = {name: (getattr(Job, name), None) for name in (
+    'id', 'title', 'department', 'location', 'description', 'requirements', 'skills_required',
+    'salary_range', 'job_type', 'status', 'deadline', 'posted_by', 'created_at', 'updated_at'
+)}
+JOB_FIELDS['posted_by_name'] = (_full_name, 'user')
+
+jobs_resource = Resource(Job.id, Job.created_at, JOB_FIELDS,
+                         default_fields=('id', 'title', 'department', 'location', 'job_type', 'created_at'))
+
+APPLICATION_FIELDS = {name: (getattr(Application, name), None) for name in (
+    'id', 'job_id', 'user_id', 'status', 'cover_letter', 'resume_filename', 'applied_at', 'updated_at', 'hr_notes'
+)}
+APPLICATION_FIELDS.update({
+    'job_title': (Job.title, 'job'),
+    'job_department': (Job.department, 'job'),
+    'applicant_name': (_full_name, 'user'),
+    'applicant_email': (User.email, 'user'),
+})
+
+applications_resource = Resource(Application.id, Application.applied_at, APPLICATION_FIELDS,
+                                 default_fields=('id', 'job_id', 'job_title', 'status', 'applied_at'),
+                                 restricted=('hr_notes',))
+
+INTERVIEW_FIELDS = {name: (getattr(Interview, name), None) for name in (
+    'id', 'application_id', 'scheduled_date', 'duration_minutes', 'interview_type', 'location_or_link',
+    'interviewer_email', 'notes', 'status', 'created_at', 'updated_at'
+)}
+INTERVIEW_FIELDS.update({
+    'job_title': (Job.title, 'job'),
+    'candidate_name': (_full_name, 'user'),
+    'candidate_email': (User.email, 'user'),
+})
+
+interviews_resource = Resource(Interview.id, Interview.scheduled_date, INTERVIEW_FIELDS,
+                               default_fields=('id', 'application_id', 'job_title', 'scheduled_date',
+                                               'interview_type', 'status'))
+
+
+def _serialize(rows, names):
+    """Turn result rows into plain dicts holding only the requested fields."""
+    items = []
+    for row in rows:
+        mapping = row._mapping
+        item = {}
+        for name in names:
+            value = mapping[name]
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            item[name] = value
+        items.append(item)
+    return items
+
+
+def _error(message, status):
+    return jsonify({'error': message}), status
+
+
+def _limit():
+    return max(1, min(request.args.get('limit', DEFAULT_LIMIT, type=int), MAX_LIMIT))
+
+
+def _listing(resource, query, names, descending=True):
+    page = keyset_paginate(query, resource.sort_column, resource.id_column,
+                           after=request.args.get('cursor'), per_page=_limit(), descending=descending)
+    return jsonify({'data': _serialize(page.items, names), 'next_cursor': page.next_cursor})
+
+
+@api_bp.before_request
+def require_login():
+    if not current_user.is_authenticated:
+        return _error('Authentication required', 401)
+
+
+@api_bp.errorhandler(InvalidFields)
+def bad_request(error):
+    return _error(str(error), 400)
+
+
+@api_bp.route('/jobs')
+def jobs():
+    names, columns, joins = jobs_resource.select(request.args.get('fields'))
+    query = db.session.query(*columns).select_from(Job)
+    if 'user' in joins:
+        query = query.join(User, Job.posted_by == User.id)
+
+    status = request.args.get('status', 'active')
+    if current_user.role not in ['hr', 'manager']:
+        status = 'active'
+    if status != 'all':
+        query = query.filter(Job.status == status)
+    if request.args.get('department'):
+        query = query.filter(Job.department == request.args['department'])
+    if request.args.get('location'):
+        query = query.filter(Job.location == request.args['location'])
+    if request.args.get('search'):
+        # Cursor pagination needs a stable order, so search only filters here
+        query = apply_search(query, request.args['search']).order_by(None)
+
+    return _listing(jobs_resource, query, names)
+
+
+@api_bp.route('/jobs/<int:job_id>')
+def job(job_id):
+    names, columns, joins = jobs_resource.select(request.args.get('fields'))
+    query = db.session.query(*columns).filter(Job.id == job_id)
+    if 'user' in joins:
+        query = query.join(User, Job.posted_by == User.id)
+    if current_user.role not in ['hr', 'manager']:
+        query = query.filter(Job.status == 'active')
+    row = query.first()
+    if row is None:
+        return _error('Job not found', 404)
+    return jsonify(_serialize([row], names)[0])
+
+
+@api_bp.route('/applications')
+def applications():
+    names, columns, joins = applications_resource.select(request.args.get('fields'))
+    query = db.session.query(*columns)
+    if 'job' in joins:
+        query = query.join(Job, Application.job_id == Job.id)
+    if 'user' in joins:
+        query = query.join(User, Application.user_id == User.id)
+
+    if current_user.role not in ['hr', 'manager']:
+        query = query.filter(Application.user_id == current_user.id)
+    if request.args.get('status'):
+        query = query.filter(Application.status == request.args['status'])
+    if request.args.get('job_id', type=int):
+        query = query.filter(Application.job_id == request.args.get('job_id', type=int))
+
+    return _listing(applications_resource, query, names)
+
+
+@api_bp.route('/interviews')
+def interviews():
+    names, columns, joins = interviews_resource.select(request.args.get('fields'))
+    query = db.session.query(*columns)
+    employee = current_user.role not in ['hr', 'manager']
+    if joins or employee:
+        query = query.join(Application, Interview.application_id == Application.id)
+    if 'job' in joins:
+        query = query.join(Job, Application.job_id == Job.id)
+    if 'user' in joins:
+        query = query.join(User, Application.user_id == User.id)
+
+    if employee:
+        query = query.filter(Application.user_id == current_user.id)
+    if request.args.get('status'):
+        query = query.filter(Interview.status == request.args['status'])
+
+    # Upcoming interviews read in date order
+    return _listing(interviews_resource, query, names, descending=False)
@@ -1,10 +1,20 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, abort, stream_with_context
 from flask_login import login_required, current_user
 from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload, defer, load_only
 from app import db
-from app.models import Job, Application
-from app.utils.file_helper import save_uploaded_file, delete_file
-from app.utils.email_helper import send_application_status_notification
+from app.models import APPLICATION_STATUSES, Job, Application, User, Interview
+from app.utils.file_helper import save_uploaded_file, delete_file, retain_file, send_resume
+from app.utils.email_helper import (send_application_status_notification, application_status_message,
+                                    send_bulk_emails)
+from app.utils.query_counter import query_budget
+from app.utils.pagination import KeysetPagination, paginate_listing, invalidate_totals
+from app.utils.stats import invalidate_stats
+from app.utils.skills import rank_applications
+from app.utils.export import csv_stream, xlsx_stream
+from app.utils.notifications import notify, status_notification
 
 applications_bp = Blueprint('applications', __name__)
 
@@ -41,9 +51,19 @@ def apply(job_id):
             else:
                 flash('Invalid file type. Please upload PDF, DOC, or DOCX files only.', 'danger')
                 return render_template('applications/apply.html', job=job)
+        elif request.form.get('use_profile_resume') and current_user.resume_filename:
+            # Share the stored profile resume instead of uploading it again
+            application.resume_filename = retain_file(current_user.resume_filename)
         
         db.session.add(application)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent submission already created this application. The rollback also
+            # undoes the resume reference taken above and removes a newly stored file
+            db.session.rollback()
+            flash('You have already applied to this job', 'warning')
+            return redirect(url_for('jobs.job_detail', job_id=job_id))
         
         flash('Application submitted successfully!', 'success')
         return redirect(url_for('applications.my_applications'))
@@ -52,24 +72,26 @@ def apply(job_id):
 
 @applications_bp.route('/my-applications')
 @login_required
+@query_budget(4)
 def my_applications():
-    page = request.args.get('page', 1, type=int)
-    applications = Application.query.filter_by(user_id=current_user.id)\
-                                  .order_by(Application.applied_at.desc())\
-                                  .paginate(page=page, per_page=10, error_out=False)
+    query = Application.query.filter_by(user_id=current_user.id)\
+                             .options(joinedload(Application.job), selectinload(Application.interviews))
+    applications = paginate_listing(query, Application.applied_at, Application.id,
+                                    cache_key=('my_applications', current_user.id), per_page=10)
     
     return render_template('applications/my_applications.html', applications=applications)
 
 @applications_bp.route('/manage')
 @login_required
+@query_budget(5)
 def manage_applications():
     if current_user.role not in ['hr', 'manager']:
         flash('Access denied', 'danger')
         return redirect(url_for('jobs.employee_dashboard'))
     
-    page = request.args.get('page', 1, type=int)
     status_filter = request.args.get('status', '')
     job_filter = request.args.get('job_id', type=int)
+    rank_filter = request.args.get('rank') if job_filter else None
     
     query = Application.query
     
@@ -78,15 +100,82 @@ def manage_applications():
     if job_filter:
         query = query.filter_by(job_id=job_filter)
     
-    applications = query.order_by(Application.applied_at.desc())\
-                       .paginate(page=page, per_page=20, error_out=False)
+    list_options = (
+        defer(Application.cover_letter),
+        defer(Application.hr_notes),
+        joinedload(Application.applicant).load_only(
+            User.first_name, User.last_name, User.email, User.department
+        ),
+        joinedload(Application.job).load_only(Job.title, Job.location, Job.department)
+    )
+    
+    # Get all jobs for filter dropdown; ranking falls back to skills_required for unprocessed jobs
+    job_columns = (Job.id, Job.title, Job.department) + ((Job.skills_required,) if rank_filter == 'skills' else ())
+    jobs = Job.query.options(load_only(*job_columns)).order_by(Job.title).all()
     
-    # Get all jobs for filter dropdown
-    jobs = Job.query.order_by(Job.title).all()
+    match_scores = None
+    if rank_filter == 'skills':
+        # Best candidates for the selected job by skills match
+        job = next((job for job in jobs if job.id == job_filter), None) or Job.query.get_or_404(job_filter)
+        ranked = rank_applications(job, query)
+        top = ranked[:current_app.config.get('SKILL_RANK_LIMIT', 50)]
+        match_scores = {application_id: (score, matched) for application_id, score, matched in top}
+        by_id = {application.id: application for application in
+                 query.options(*list_options).filter(Application.id.in_(match_scores)).all()}
+        applications = KeysetPagination([by_id[application_id] for application_id, _, _ in top if application_id in by_id],
+                                        per_page=len(top), total=len(ranked), next_cursor=None, is_first=True)
+    else:
+        applications = paginate_listing(query.options(*list_options), Application.applied_at, Application.id,
+                                        cache_key=('manage_applications', status_filter, job_filter))
     
     return render_template('applications/manage_applications.html', 
-                         applications=applications, jobs=jobs,
-                         current_filters={'status': status_filter, 'job_id': job_filter})
+                         applications=applications, jobs=jobs, match_scores=match_scores,
+                         current_filters={'status': status_filter, 'job_id': job_filter, 'rank': rank_filter})
+
+EXPORT_COLUMNS = ('Application ID', 'Candidate', 'Email', 'Job', 'Department', 'Status',
+                  'Applied At', 'Updated At', 'Interviews')
+
+@applications_bp.route('/export')
+@login_required
+def export_applications():
+    if current_user.role not in ['hr', 'manager']:
+        flash('Access denied', 'danger')
+        return redirect(url_for('jobs.employee_dashboard'))
+    
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'xlsx'):
+        abort(404)
+    status_filter = request.args.get('status', '')
+    job_filter = request.args.get('job_id', type=int)
+    
+    interview_count = select(func.count(Interview.id))\
+        .where(Interview.application_id == Application.id)\
+        .correlate(Application).scalar_subquery()
+    query = db.session.query(
+        Application.id, User.first_name + ' ' + User.last_name, User.email, Job.title, Job.department,
+        Application.status, Application.applied_at, Application.updated_at, interview_count
+    ).join(User, Application.user_id == User.id).join(Job, Application.job_id == Job.id)
+    
+    # Same filters as manage_applications
+    if status_filter:
+        query = query.filter(Application.status == status_filter)
+    if job_filter:
+        query = query.filter(Application.job_id == job_filter)
+    
+    # Server-side cursor where the driver supports it; rows are fetched and written in batches
+    rows = query.order_by(Application.applied_at.desc(), Application.id.desc())\
+                .execution_options(stream_results=True).yield_per(1000)
+    
+    filename = f"applications-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+    if export_format == 'xlsx':
+        body = xlsx_stream(EXPORT_COLUMNS, rows, sheet_name='Applications')
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        body = csv_stream(EXPORT_COLUMNS, rows)
+        mimetype = 'text/csv'
+    response = current_app.response_class(stream_with_context(body), mimetype=mimetype)
+    response.headers.set('Content-Disposition', 'attachment', filename=filename)
+    return response
 
 @applications_bp.route('/<int:application_id>')
 @login_required
@@ -100,6 +189,22 @@ def application_detail(application_id):
     
     return render_template('applications/application_detail.html', application=application)
 
+@applications_bp.route('/<int:application_id>/resume')
+@login_required
+def download_resume(application_id):
+    application = Application.query.options(
+        load_only(Application.user_id, Application.resume_filename)
+    ).get_or_404(application_id)
+    
+    # Check permissions
+    if current_user.role not in ['hr', 'manager'] and application.user_id != current_user.id:
+        flash('Access denied', 'danger')
+        return redirect(url_for('applications.my_applications'))
+    if not application.resume_filename:
+        abort(404)
+    
+    return send_resume(application.resume_filename)
+
 @applications_bp.route('/<int:application_id>/update-status', methods=['POST'])
 @login_required
 def update_status(application_id):
@@ -115,20 +220,67 @@ def update_status(application_id):
     application.status = new_status
     application.hr_notes = hr_notes
     application.updated_at = datetime.utcnow()
-    
-    db.session.commit()
-    
-    # Send notification email if status changed
+    # Notify the candidate if the status changed; the email is queued by this commit
     if old_status != new_status:
+        notify([status_notification(application.user_id, application.job.title, new_status)])
         send_application_status_notification(
             application.applicant.email,
             application.job.title,
             new_status
         )
     
+    db.session.commit()
+    
     flash('Application status updated successfully!', 'success')
     return redirect(url_for('applications.application_detail', application_id=application_id))
 
+@applications_bp.route('/bulk-update-status', methods=['POST'])
+@login_required
+def bulk_update_status():
+    if current_user.role not in ['hr', 'manager']:
+        flash('Access denied', 'danger')
+        return redirect(url_for('applications.my_applications'))
+    
+    application_ids = request.form.getlist('application_ids', type=int)
+    new_status = request.form.get('status')
+    hr_notes = request.form.get('hr_notes', '').strip()
+    
+    if not application_ids or new_status not in APPLICATION_STATUSES:
+        flash('Select at least one application and a status.', 'warning')
+        return redirect(url_for('applications.manage_applications'))
+    
+    # Only candidates whose status actually changes are notified
+    changed = db.session.query(Application.user_id, User.email, Job.title)\
+                        .select_from(Application)\
+                        .join(User, Application.user_id == User.id)\
+                        .join(Job, Application.job_id == Job.id)\
+                        .filter(Application.id.in_(application_ids),
+                                db.func.coalesce(Application.status, '') != new_status)\
+                        .all()
+    
+    values = {'status': new_status, 'updated_at': datetime.utcnow()}
+    if hr_notes:
+        values['hr_notes'] = hr_notes
+    
+    # One set-based UPDATE and one commit for the whole selection
+    updated = Application.query.filter(Application.id.in_(application_ids))\
+                               .update(values, synchronize_session=False)
+    notify([status_notification(user_id, title, new_status) for user_id, _, title in changed])
+    send_bulk_emails([application_status_message(email, title, new_status) for _, email, title in changed])
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        flash('Database error: unable to update the selected applications.', 'danger')
+        return redirect(url_for('applications.manage_applications'))
+    
+    # Bulk UPDATEs bypass the ORM events that maintain these caches
+    invalidate_stats()
+    invalidate_totals()
+    
+    flash(f'Updated {updated} applications to {new_status.title()}.', 'success')
+    return redirect(url_for('applications.manage_applications'))
+
 @applications_bp.route('/<int:application_id>/withdraw', methods=['POST'])
 @login_required
 def withdraw_application(application_id):
@@ -1,12 +1,92 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+import hashlib
+from flask import (Blueprint, render_template, request, flash, redirect, url_for, jsonify, abort,
+                   current_app, make_response, stream_with_context)
 from flask_login import login_required, current_user
-from datetime import datetime
+from datetime import datetime, timedelta
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import func, insert
 from app import db
-from app.models import Application, Interview
-from app.utils.email_helper import send_interview_invitation
+from sqlalchemy.orm import joinedload, load_only
+from app.models import Application, Interview, Job, User
+from app.utils.email_helper import send_interview_invitation, interview_invitation_message, send_bulk_emails
+from app.utils.notifications import notify, interview_notification
+from app.utils.query_counter import query_budget
+from app.utils.pagination import paginate_listing, invalidate_totals
+from app.utils.stats import invalidate_stats
+from app.utils.ical import calendar_lines, interview_event, interview_sequence
+from app.utils.scheduling import (MAX_INTERVIEW_MINUTES, bookings, overlapping, find_conflicts,
+                                  describe_conflicts, free_slots)
 
 interviews_bp = Blueprint('interviews', __name__)
 
+# Calendar feeds include this much history; everything upcoming is always included
+CALENDAR_HISTORY_DAYS = 30
+
+def _calendar_serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='interview-calendar')
+
+def _password_fingerprint(user):
+    # Changing the password invalidates previously shared feed URLs
+    return hashlib.sha256(user.password.encode()).hexdigest()[:12]
+
+def calendar_token(user):
+    return _calendar_serializer().dumps([user.id, _password_fingerprint(user)])
+
+def _calendar_user(token):
+    try:
+        user_id, fingerprint = _calendar_serializer().loads(token)
+    except (BadSignature, TypeError, ValueError):
+        return None
+    user = db.session.get(User, user_id)
+    if user is None or _password_fingerprint(user) != fingerprint:
+        return None
+    return user
+
+def _interview_events(query):
+    """Stream interview rows into VEVENTs without building ORM objects."""
+    stamp = datetime.utcnow()
+    rows = query.with_entities(
+        Interview.id, Interview.scheduled_date, Interview.duration_minutes, Interview.interview_type,
+        Interview.location_or_link, Interview.notes, Interview.status, Interview.created_at,
+        Interview.updated_at, Job.title, User.first_name, User.last_name
+    ).order_by(Interview.scheduled_date.asc(), Interview.id.asc()).yield_per(500)
+    for (interview_id, start, duration, interview_type, location_or_link, notes, status,
+         created_at, updated_at, job_title, first_name, last_name) in rows:
+        yield interview_event(interview_id, start, duration, job_title, interview_type, location_or_link,
+                              status=status, sequence=interview_sequence(created_at, updated_at),
+                              notes=notes, candidate_name=f'{first_name} {last_name}', stamp=stamp)
+
+def _calendar_response(query, name, filename=None):
+    """Stream a calendar for `query`, answering 304 when nothing in it has changed.
+
+    The validators come from COUNT and MAX(updated_at) over the same rows,
+    so polling clients are answered without reading any interview rows.
+    """
+    count, last_updated = query.with_entities(func.count(Interview.id), func.max(Interview.updated_at)).one()
+    etag = hashlib.sha1(f'{name}:{count}:{last_updated}'.encode()).hexdigest()
+    if request.if_none_match.contains(etag) or (
+            not request.if_none_match and last_updated and request.if_modified_since
+            and last_updated.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)):
+        response = make_response('', 304)
+    else:
+        response = current_app.response_class(
+            stream_with_context(calendar_lines(_interview_events(query), name=name)),
+            mimetype='text/calendar'
+        )
+        if filename:
+            response.headers.set('Content-Disposition', 'attachment', filename=filename)
+    response.set_etag(etag)
+    if last_updated:
+        response.last_modified = last_updated
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def _interviews_with_details():
+    return Interview.query.join(Application, Interview.application_id == Application.id)\
+                          .join(Job, Application.job_id == Job.id)\
+                          .join(User, Application.user_id == User.id)
+
 @interviews_bp.route('/schedule/<int:application_id>', methods=['GET', 'POST'])
 @login_required
 def schedule_interview(application_id):
@@ -33,6 +113,20 @@ def schedule_interview(application_id):
             flash('Invalid date or time format.', 'danger')
             return render_template('interviews/schedule.html', application=application)
 
+        if not 0 < duration <= MAX_INTERVIEW_MINUTES:
+            flash(f'Interviews can last at most {MAX_INTERVIEW_MINUTES} minutes.', 'danger')
+            return render_template('interviews/schedule.html', application=application)
+
+        # Reject double bookings for the interviewer or the candidate
+        conflicts = find_conflicts(interview_datetime, duration, interviewer_email=interviewer_email,
+                                   candidate_id=application.user_id)
+        if conflicts:
+            flash(f'Time slot unavailable. {describe_conflicts(conflicts, interviewer_email)}.', 'danger')
+            _, suggested_slots = free_slots(interviewer_email, interview_datetime.date(), duration=duration,
+                                            candidate_id=application.user_id, limit=8)
+            return render_template('interviews/schedule.html', application=application,
+                                   suggested_slots=suggested_slots)
+
         # Create Interview record
         interview = Interview(
             application_id=application.id,
@@ -49,49 +143,229 @@ def schedule_interview(application_id):
         # Update application status
         application.status = 'interview'
         application.updated_at = datetime.utcnow()
+        notify([interview_notification(application.user_id, application.job.title, interview_datetime)])
 
         try:
+            # The calendar attachment needs the interview id; the email is queued by this commit
+            db.session.flush()
+            send_interview_invitation(
+                application.applicant.email,
+                application.job.title,
+                interview_datetime,
+                interview_type,
+                location_or_link,
+                interview_id=interview.id,
+                duration_minutes=duration
+            )
             db.session.commit()
         except Exception as e:
             db.session.rollback()
             flash('Database error: unable to schedule the interview.', 'danger')
             return render_template('interviews/schedule.html', application=application)
 
-        # Send email notification to candidate
-        send_interview_invitation(
-            application.applicant.email,
-            application.job.title,
-            interview_datetime,
-            interview_type,
-            location_or_link
-        )
-
         flash('Interview scheduled successfully!', 'success')
         return redirect(url_for('applications.application_detail', application_id=application.id))
 
     # GET: render scheduling form
     return render_template('interviews/schedule.html', application=application)
 
+@interviews_bp.route('/schedule-bulk', methods=['GET', 'POST'])
+@login_required
+def schedule_bulk():
+    if current_user.role not in ['hr', 'manager']:
+        flash('Access denied', 'danger')
+        return redirect(url_for('jobs.employee_dashboard'))
+
+    application_ids = request.values.getlist('application_ids', type=int)
+    applications = Application.query.filter(Application.id.in_(application_ids)).options(
+        load_only(Application.id, Application.user_id, Application.applied_at),
+        joinedload(Application.applicant).load_only(User.first_name, User.last_name, User.email),
+        joinedload(Application.job).load_only(Job.title, Job.department)
+    ).order_by(Application.applied_at.asc(), Application.id.asc()).all()
+
+    if not applications:
+        flash('Select at least one application to schedule.', 'warning')
+        return redirect(url_for('applications.manage_applications'))
+
+    if request.method == 'POST':
+        scheduled_date = request.form.get('scheduled_date')
+        scheduled_time = request.form.get('scheduled_time')
+        duration = int(request.form.get('duration', 60))
+        break_minutes = int(request.form.get('break_minutes', 0))
+        interview_type = request.form.get('interview_type')
+        location_or_link = request.form.get('location_or_link')
+        interviewer_email = request.form.get('interviewer_email')
+        notes = request.form.get('notes')
+
+        try:
+            slot = datetime.strptime(f"{scheduled_date} {scheduled_time}", '%Y-%m-%d %H:%M')
+        except ValueError:
+            flash('Invalid date or time format.', 'danger')
+            return render_template('interviews/schedule_bulk.html', applications=applications)
+
+        if not 0 < duration <= MAX_INTERVIEW_MINUTES:
+            flash(f'Interviews can last at most {MAX_INTERVIEW_MINUTES} minutes.', 'danger')
+            return render_template('interviews/schedule_bulk.html', applications=applications)
+
+        # One lookup for everyone's existing bookings across the whole block
+        block_end = slot + timedelta(minutes=(duration + break_minutes) * len(applications))
+        booked = bookings(slot, block_end, interviewer_email=interviewer_email,
+                          candidate_ids={application.user_id for application in applications})
+
+        # Back-to-back slots in application order
+        interviews = []
+        invitations = []
+        notifications = []
+        conflicts = []
+        for application in applications:
+            interviews.append({
+                'application_id': application.id,
+                'scheduled_date': slot,
+                'duration_minutes': duration,
+                'interview_type': interview_type,
+                'location_or_link': location_or_link,
+                'interviewer_email': interviewer_email,
+                'notes': notes,
+                'status': 'scheduled'
+            })
+            invitations.append((
+                application.applicant.email,
+                application.job.title,
+                slot
+            ))
+            notifications.append(interview_notification(application.user_id, application.job.title, slot))
+            clashes = [booking for booking in overlapping(booked, slot, slot + timedelta(minutes=duration))
+                       if booking.interviewer_email == interviewer_email or booking.user_id == application.user_id]
+            if clashes:
+                conflicts.append(f"{application.applicant.get_full_name()} at {slot.strftime('%H:%M')}: "
+                                 f"{describe_conflicts(clashes, interviewer_email)}")
+            slot += timedelta(minutes=duration + break_minutes)
+
+        if conflicts:
+            flash('Some slots are unavailable. ' + ' | '.join(conflicts), 'danger')
+            return render_template('interviews/schedule_bulk.html', applications=applications)
+
+        interview_ids = db.session.scalars(
+            insert(Interview).returning(Interview.id, sort_by_parameter_order=True), interviews
+        ).all()
+        Application.query.filter(Application.id.in_([application.id for application in applications]))\
+                         .update({'status': 'interview', 'updated_at': datetime.utcnow()},
+                                 synchronize_session=False)
+        notify(notifications)
+        send_bulk_emails([
+            interview_invitation_message(email, job_title, start, interview_type, location_or_link,
+                                         interview_id=interview_id, duration_minutes=duration)
+            for (email, job_title, start), interview_id in zip(invitations, interview_ids)
+        ])
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            flash('Database error: unable to schedule the interviews.', 'danger')
+            return render_template('interviews/schedule_bulk.html', applications=applications)
+
+        # Bulk writes bypass the ORM events that maintain these caches
+        invalidate_stats()
+        invalidate_totals()
+
+        flash(f'Scheduled {len(interviews)} interviews.', 'success')
+        return redirect(url_for('interviews.interview_list'))
+
+    return render_template('interviews/schedule_bulk.html', applications=applications)
+
+@interviews_bp.route('/free-slots')
+@login_required
+def suggest_slots():
+    if current_user.role not in ['hr', 'manager']:
+        return jsonify({'error': 'Access denied'}), 403
+
+    interviewer_email = request.args.get('interviewer_email') or current_user.email
+    duration = request.args.get('duration', 60, type=int)
+    days = max(1, min(request.args.get('days', 5, type=int), 30))
+    try:
+        start_date = datetime.strptime(request.args['date'], '%Y-%m-%d').date() if request.args.get('date') \
+            else datetime.utcnow().date() + timedelta(days=1)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    if not 0 < duration <= MAX_INTERVIEW_MINUTES:
+        return jsonify({'error': f'Duration must be 1-{MAX_INTERVIEW_MINUTES} minutes'}), 400
+
+    candidate_id = None
+    application_id = request.args.get('application_id', type=int)
+    if application_id:
+        candidate_id = Application.query.options(load_only(Application.user_id)).get_or_404(application_id).user_id
+
+    windows, slots = free_slots(interviewer_email, start_date, days=days, duration=duration,
+                                candidate_id=candidate_id, limit=request.args.get('limit', 20, type=int))
+    return jsonify({
+        'interviewer_email': interviewer_email,
+        'windows': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in windows],
+        'slots': [slot.isoformat() for slot in slots]
+    })
+
+@interviews_bp.route('/calendar/<token>.ics')
+def calendar_feed(token):
+    """Per-user subscription feed; the signed token stands in for the login session."""
+    user = _calendar_user(token)
+    if user is None:
+        abort(404)
+
+    since = datetime.utcnow() - timedelta(days=CALENDAR_HISTORY_DAYS)
+    query = _interviews_with_details().filter(Interview.scheduled_date >= since)
+    if user.role in ['hr', 'manager']:
+        # Interviewers subscribe to the interviews they conduct
+        query = query.filter(Interview.interviewer_email == user.email)
+    else:
+        query = query.filter(Application.user_id == user.id)
+    return _calendar_response(query, name='TalentBridge Interviews')
+
+@interviews_bp.route('/export.ics')
+@login_required
+def export_calendar():
+    if current_user.role not in ['hr', 'manager']:
+        flash('Access denied', 'danger')
+        return redirect(url_for('jobs.employee_dashboard'))
+
+    query = _interviews_with_details()
+    status_filter = request.args.get('status', '')
+    if status_filter:
+        query = query.filter(Interview.status == status_filter)
+    return _calendar_response(query, name='TalentBridge Interviews', filename='interviews.ics')
+
 @interviews_bp.route('/list')
 @login_required
+@query_budget(4)
 def interview_list():
     status_filter = request.args.get('status', '')
-    page = request.args.get('page', 1, type=int)
 
     if current_user.role == 'employee':
         # Employees see only their own interviews
         interviews = Interview.query.join(Application).filter(
             Application.user_id == current_user.id
+        ).options(
+            joinedload(Interview.application).load_only(Application.id)
+                .joinedload(Application.job).load_only(Job.title, Job.department, Job.location)
         ).order_by(Interview.scheduled_date.asc()).all()
-        return render_template('interviews/my_interviews.html', interviews=interviews)
+        return render_template('interviews/my_interviews.html', interviews=interviews,
+                               calendar_url=url_for('interviews.calendar_feed',
+                                                    token=calendar_token(current_user.user), _external=True))
 
     # HR and managers see all interviews, optionally filtered by status
-    query = Interview.query
+    query = Interview.query.options(
+        joinedload(Interview.application).load_only(Application.id)
+            .joinedload(Application.applicant).load_only(User.first_name, User.last_name, User.email),
+        joinedload(Interview.application).load_only(Application.id)
+            .joinedload(Application.job).load_only(Job.title, Job.department)
+    )
     if status_filter:
         query = query.filter_by(status=status_filter)
 
-    interviews = query.order_by(Interview.scheduled_date.asc()).paginate(page=page, per_page=20, error_out=False)
-    return render_template('interviews/interview_list.html', interviews=interviews, current_filter=status_filter)
+    interviews = paginate_listing(query, Interview.scheduled_date, Interview.id,
+                                  cache_key=('interview_list', status_filter), descending=False)
+    return render_template('interviews/interview_list.html', interviews=interviews, current_filter=status_filter,
+                           calendar_url=url_for('interviews.calendar_feed',
+                                                token=calendar_token(current_user.user), _external=True))
 
 @interviews_bp.route('/<int:interview_id>/update', methods=['POST'])
 @login_required
@@ -139,9 +413,34 @@ def reschedule_interview(interview_id):
             flash('Invalid date or time format.', 'danger')
             return render_template('interviews/reschedule.html', interview=interview)
 
+        conflicts = find_conflicts(new_datetime, interview.duration_minutes or 60,
+                                   interviewer_email=interview.interviewer_email,
+                                   candidate_id=interview.application.user_id, exclude_id=interview.id)
+        if conflicts:
+            flash(f'Time slot unavailable. {describe_conflicts(conflicts, interview.interviewer_email)}.', 'danger')
+            _, suggested_slots = free_slots(interview.interviewer_email, new_datetime.date(),
+                                            duration=interview.duration_minutes or 60,
+                                            candidate_id=interview.application.user_id,
+                                            exclude_id=interview.id, limit=8)
+            return render_template('interviews/reschedule.html', interview=interview,
+                                   suggested_slots=suggested_slots)
+
         interview.scheduled_date = new_datetime
         interview.status = 'rescheduled'
         interview.updated_at = datetime.utcnow()
+        notify([interview_notification(interview.application.user_id, interview.application.job.title,
+                                       new_datetime, rescheduled=True)])
+        # Notify candidate of rescheduled interview; the email is queued by this commit
+        send_interview_invitation(
+            interview.application.applicant.email,
+            interview.application.job.title,
+            new_datetime,
+            interview.interview_type,
+            interview.location_or_link,
+            interview_id=interview.id,
+            duration_minutes=interview.duration_minutes,
+            sequence=interview_sequence(interview.created_at, interview.updated_at)
+        )
 
         try:
             db.session.commit()
@@ -150,15 +449,6 @@ def reschedule_interview(interview_id):
             flash('Error rescheduling interview.', 'danger')
             return render_template('interviews/reschedule.html', interview=interview)
 
-        # Notify candidate of rescheduled interview
-        send_interview_invitation(
-            interview.application.applicant.email,
-            interview.application.job.title,
-            new_datetime,
-            interview.interview_type,
-            interview.location_or_link
-        )
-
         flash('Interview rescheduled successfully!', 'success')
         return redirect(url_for('interviews.interview_list'))
 
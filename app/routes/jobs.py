@@ -1,20 +1,30 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, make_response, g
 from flask_login import login_required, current_user
 from datetime import datetime
 from app import db
+from sqlalchemy.orm import joinedload, load_only
 from app.models import Job, Application, User
 from app.utils.email_helper import send_new_job_notification
+from app.utils.search import apply_search
+from app.utils.query_counter import query_budget
+from app.utils.pagination import paginate_listing
+from app.utils.stats import get_dashboard_stats
+from app.utils.facets import get_job_facets
+from app.utils.typeahead import suggest
+from app.utils.page_cache import job_fragments, make_etag, not_modified, cache_headers
 
 jobs_bp = Blueprint('jobs', __name__)
 
 @jobs_bp.route('/employee-dashboard')
 @login_required
+@query_budget(2)
 def employee_dashboard():
     # Get recent jobs
     recent_jobs = Job.query.filter_by(status='active').order_by(Job.created_at.desc()).limit(5).all()
     
     # Get user's applications
     my_applications = Application.query.filter_by(user_id=current_user.id)\
+                                    .options(joinedload(Application.job).load_only(Job.title))\
                                     .order_by(Application.applied_at.desc()).limit(5).all()
     
     return render_template('dashboard/employee_dashboard.html', 
@@ -22,32 +32,29 @@ def employee_dashboard():
 
 @jobs_bp.route('/hr-dashboard')
 @login_required
+@query_budget(2)
 def hr_dashboard():
     if current_user.role not in ['hr', 'manager']:
         flash('Access denied', 'danger')
         return redirect(url_for('jobs.employee_dashboard'))
     
-    # Get job statistics
-    total_jobs = Job.query.count()
-    active_jobs = Job.query.filter_by(status='active').count()
-    total_applications = Application.query.count()
-    pending_applications = Application.query.filter_by(status='submitted').count()
+    # Cached job/application counters, maintained on writes
+    stats = get_dashboard_stats()
     
     # Recent applications
-    recent_applications = Application.query.order_by(Application.applied_at.desc()).limit(10).all()
-    
-    stats = {
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications
-    }
+    recent_applications = Application.query.options(
+        load_only(Application.id, Application.status, Application.applied_at),
+        joinedload(Application.applicant).load_only(User.first_name, User.last_name),
+        joinedload(Application.job).load_only(Job.title)
+    ).order_by(Application.applied_at.desc()).limit(10).all()
     
     return render_template('dashboard/hr_dashboard.html', 
                          stats=stats, recent_applications=recent_applications)
 
 @jobs_bp.route('/list')
 @login_required
+# Page and count, plus the search index check and the facets when their caches are cold
+@query_budget(4)
 def job_list():
     page = request.args.get('page', 1, type=int)
     department = request.args.get('department', '')
@@ -55,32 +62,63 @@ def job_list():
     search = request.args.get('search', '')
     
     # Build query
-    query = Job.query.filter_by(status='active')
+    query = Job.query.filter_by(status='active').options(
+        joinedload(Job.posted_by_user).load_only(User.first_name, User.last_name)
+    )
     
     if department:
         query = query.filter(Job.department.ilike(f'%{department}%'))
     if location:
         query = query.filter(Job.location.ilike(f'%{location}%'))
     if search:
-        query = query.filter(
-            db.or_(
-                Job.title.ilike(f'%{search}%'),
-                Job.description.ilike(f'%{search}%'),
-                Job.skills_required.ilike(f'%{search}%')
-            )
+        # Ranked full-text match, falling back to ILIKE without an index
+        query = apply_search(query, search)
+        jobs = query.order_by(Job.created_at.desc()).paginate(
+            page=page, per_page=10, error_out=False
         )
-    
-    jobs = query.order_by(Job.created_at.desc()).paginate(
-        page=page, per_page=10, error_out=False
-    )
-    
-    # Get unique departments and locations for filters
-    departments = db.session.query(Job.department.distinct()).all()
-    locations = db.session.query(Job.location.distinct()).all()
-    
-    return render_template('jobs/job_list.html', 
-                         jobs=jobs, departments=departments, locations=locations,
-                         current_filters={'department': department, 'location': location, 'search': search})
+    else:
+        jobs = paginate_listing(query, Job.created_at, Job.id,
+                                cache_key=('job_list', department, location), per_page=10)
+    
+    # Filter dropdowns: cached active-job counts, maintained on writes
+    facets = get_job_facets()
+    
+    # The navbar (name, unread badge) is part of the page too
+    etag = make_etag(current_user.id, current_user.role, g.get('unread_notifications'), request.full_path,
+                     jobs.total, [(job.id, job.updated_at) for job in jobs.items],
+                     facets.departments, facets.locations)
+    if not_modified(etag):
+        return cache_headers(make_response('', 304), etag)
+    
+    # Job cards are identical for every viewer; render each once per version
+    job_cards = {job.id: job_fragments.render(('job_card', job.id, job.updated_at), 'jobs/_job_card.html', job=job)
+                 for job in jobs.items}
+    
+    response = make_response(render_template('jobs/job_list.html', 
+                         jobs=jobs, job_cards=job_cards, departments=facets.departments, locations=facets.locations,
+                         current_filters={'department': department, 'location': location, 'search': search}))
+    return cache_headers(response, etag)
+
+@jobs_bp.route('/facets')
+@login_required
+def job_facets():
+    return jsonify(get_job_facets().to_dict())
+
+@jobs_bp.route('/typeahead')
+@login_required
+def typeahead():
+    limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+    results = suggest(request.args.get('q', ''), limit)
+    for job in results['jobs']:
+        job['url'] = url_for('jobs.job_detail', job_id=job['id'])
+    return jsonify(results)
+
+@jobs_bp.route('/cache-stats')
+@login_required
+def cache_stats():
+    if current_user.role not in ['hr', 'manager']:
+        return jsonify({'error': 'Access denied'}), 403
+    return jsonify({'job_fragments': job_fragments.stats()})
 
 @jobs_bp.route('/<int:job_id>')
 @login_required
@@ -94,8 +132,23 @@ def job_detail(job_id):
             job_id=job_id, user_id=current_user.id
         ).first()
     
-    return render_template('jobs/job_detail.html', 
-                         job=job, existing_application=existing_application)
+    # The page varies by viewer (actions menu, application status), so validators include both
+    last_modified = job.updated_at
+    application_version = None
+    if existing_application:
+        last_modified = max(last_modified, existing_application.updated_at)
+        application_version = (existing_application.id, existing_application.status)
+    etag = make_etag(job.id, job.updated_at, current_user.id, current_user.role, application_version,
+                     g.get('unread_notifications'))
+    # The unread badge can change without last_modified moving, so only the ETag validates
+    if not_modified(etag):
+        return cache_headers(make_response('', 304), etag, last_modified)
+    
+    job_body = job_fragments.render(('job_body', job.id, job.updated_at), 'jobs/_job_body.html', job=job)
+    
+    response = make_response(render_template('jobs/job_detail.html', 
+                         job=job, job_body=job_body, existing_application=existing_application))
+    return cache_headers(response, etag, last_modified)
 
 @jobs_bp.route('/post', methods=['GET', 'POST'])
 @login_required
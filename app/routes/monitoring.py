@@ -0,0 +1,33 @@
+import hmac
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+from app import db
+from app.utils.metrics import registry, render
+
+monitoring_bp = Blueprint('monitoring', __name__)
+
+
+@monitoring_bp.route('/healthz')
+def healthz():
+    """Readiness probe: the app is up and the database answers a trivial query."""
+    try:
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+    except Exception as e:
+        current_app.logger.warning(f'Health check failed: {e}')
+        return jsonify({'status': 'unavailable'}), 503
+    return jsonify({'status': 'ok'})
+
+
+@monitoring_bp.route('/metrics')
+def metrics():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(404)
+
+    from app.utils.email_queue import queue_depth
+
+    values = registry.collect()
+    # Queue depth lives in the database, so it is read once per scrape rather than per worker
+    for status, count in queue_depth().items():
+        values[('email_queue_depth', (('status', status),))] = count
+    return Response(render(values), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from flask import (Blueprint, Response, abort, current_app, g, jsonify, redirect, render_template, request,
+                   stream_with_context, url_for)
+from flask_login import login_required, current_user
+from app import db
+from app.models import Notification
+from app.utils.notifications import mark_read, unread_count
+from app.utils.pagination import keyset_paginate
+from app.utils.query_counter import query_budget
+
+notifications_bp = Blueprint('notifications', __name__)
+
+# Endpoints that never render the navbar, so they skip the unread-count lookup
+_NO_BADGE = {'static', 'notifications.stream', 'notifications.count'}
+
+_streams_lock = threading.Lock()
+_open_streams = 0
+
+
+@notifications_bp.before_app_request
+def load_unread_count():
+    # Looked up before the view so page query budgets measure the page, not the navbar
+    if (request.method == 'GET' and request.endpoint not in _NO_BADGE
+            and request.blueprint not in ('api', 'monitoring') and current_user.is_authenticated):
+        g.unread_notifications = unread_count(current_user.id)
+
+
+@notifications_bp.app_context_processor
+def inject_unread_count():
+    return {'unread_notifications': g.get('unread_notifications', 0)}
+
+
+@notifications_bp.route('/')
+@login_required
+@query_budget(1)
+def notification_list():
+    query = Notification.query.filter_by(user_id=current_user.id)
+    notifications = keyset_paginate(query, Notification.created_at, Notification.id,
+                                     after=request.args.get('after'), per_page=20)
+    return render_template('notifications/notification_list.html', notifications=notifications)
+
+
+@notifications_bp.route('/<int:notification_id>/read', methods=['POST'])
+@login_required
+def read(notification_id):
+    mark_read(current_user.id, [notification_id])
+    db.session.commit()
+    return redirect(url_for('notifications.notification_list', after=request.form.get('after') or None))
+
+
+@notifications_bp.route('/read-all', methods=['POST'])
+@login_required
+def read_all():
+    mark_read(current_user.id)
+    db.session.commit()
+    return redirect(url_for('notifications.notification_list'))
+
+
+@notifications_bp.route('/count')
+@login_required
+def count():
+    return jsonify({'unread': unread_count(current_user.id)})
+
+
+@notifications_bp.route('/stream')
+@login_required
+def stream():
+    """Server-Sent Events: pushes the unread count whenever it changes.
+
+    Meant for async workers. The stream closes after
+    NOTIFICATION_STREAM_TIMEOUT seconds and EventSource reconnects; past
+    NOTIFICATION_STREAM_LIMIT open streams it answers 503, which makes the
+    browser fall back to polling.
+    """
+    global _open_streams
+    if current_app.config.get('NOTIFICATION_STREAM') != 'sse':
+        abort(404)
+    with _streams_lock:
+        if _open_streams >= current_app.config['NOTIFICATION_STREAM_LIMIT']:
+            abort(503)
+        _open_streams += 1
+
+    user_id = current_user.id
+    interval = current_app.config['NOTIFICATION_STREAM_INTERVAL']
+    deadline = time.monotonic() + current_app.config['NOTIFICATION_STREAM_TIMEOUT']
+
+    def events():
+        yield f'retry: {int(interval * 1000)}\n\n'
+        last = None
+        while True:
+            # Counted afresh (an index-only scan) so other workers' writes show up promptly
+            unread = unread_count(user_id, fresh=True)
+            # Hand the connection back to the pool between checks
+            db.session.close()
+            if unread != last:
+                last = unread
+                yield f"event: unread\ndata: {json.dumps({'unread': unread})}\n\n"
+            else:
+                yield ': keep-alive\n\n'
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(interval)
+
+    def stream_closed():
+        global _open_streams
+        with _streams_lock:
+            _open_streams -= 1
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(stream_closed)
+    return response
@@ -1,8 +1,8 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort
 from flask_login import login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
-from app.utils.file_helper import save_uploaded_file, delete_file
+from app.utils.file_helper import save_uploaded_file, delete_file, send_resume
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -13,6 +13,27 @@ def profile():
     return render_template('profile/profile.html')
 
 
+@profile_bp.route('/resume')
+@login_required
+def download_resume():
+    """Redirect to the current profile resume"""
+    if not current_user.resume_filename:
+        abort(404)
+    return redirect(url_for('profile.resume_file', filename=current_user.resume_filename))
+
+
+@profile_bp.route('/resume/<path:filename>')
+@login_required
+def resume_file(filename):
+    """Serve the profile resume; the URL names the file, so it can be cached for good"""
+    if not current_user.resume_filename:
+        abort(404)
+    if filename != current_user.resume_filename:
+        # Replaced since the link was rendered
+        return redirect(url_for('profile.resume_file', filename=current_user.resume_filename))
+    return send_resume(filename, immutable=True)
+
+
 @profile_bp.route('/edit', methods=['GET', 'POST'])
 @login_required
 def edit_profile():
@@ -20,25 +41,25 @@ def edit_profile():
     Allow users to edit their profile details and upload resume.
     """
     if request.method == 'POST':
+        user = current_user.user
         # Update profile fields from form data
-        current_user.first_name = request.form.get('first_name', '').strip()
-        current_user.last_name = request.form.get('last_name', '').strip()
-        current_user.department = request.form.get('department', '').strip()
-        current_user.location = request.form.get('location', '').strip()
-        current_user.phone = request.form.get('phone', '').strip()
-        current_user.skills = request.form.get('skills', '').strip()
+        user.first_name = request.form.get('first_name', '').strip()
+        user.last_name = request.form.get('last_name', '').strip()
+        user.department = request.form.get('department', '').strip()
+        user.location = request.form.get('location', '').strip()
+        user.phone = request.form.get('phone', '').strip()
+        user.skills = request.form.get('skills', '').strip()
 
         # Handle resume file upload if provided
         resume_file = request.files.get('resume')
         if resume_file and resume_file.filename:
-            # Delete old resume file if exists
-            if current_user.resume_filename:
-                delete_file(current_user.resume_filename)
-
-            # Save new uploaded resume
+            # Save new uploaded resume (deduplicated by content)
             filename = save_uploaded_file(resume_file)
             if filename:
-                current_user.resume_filename = filename
+                # Release the old resume; it is removed once nothing references it
+                if user.resume_filename:
+                    delete_file(user.resume_filename)
+                user.resume_filename = filename
             else:
                 flash('Invalid file type. Please upload PDF, DOC, or DOCX only.', 'danger')
                 return render_template('profile/edit_profile.html')
@@ -67,9 +88,10 @@ def change_password():
         current_password = request.form.get('current_password', '')
         new_password = request.form.get('new_password', '')
         confirm_password = request.form.get('confirm_password', '')
+        user = current_user.user
 
         # Verify current password correctness
-        if not check_password_hash(current_user.password, current_password):
+        if not check_password_hash(user.password, current_password):
             flash('Current password is incorrect.', 'danger')
             return render_template('profile/change_password.html')
 
@@ -83,7 +105,7 @@ def change_password():
             return render_template('profile/change_password.html')
 
         # Update password hash in database
-        current_user.password = generate_password_hash(new_password)
+        user.password = generate_password_hash(new_password)
         try:
             db.session.commit()
             flash('Password changed successfully!', 'success')
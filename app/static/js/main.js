@@ -57,15 +57,97 @@ document.addEventListener('DOMContentLoaded', function() {
     var searchInputs = document.querySelectorAll('input[type="search"], .search-input');
     searchInputs.forEach(function(input) {
         var timeout;
+        var controller = null;
+        var url = input.getAttribute('data-typeahead-url');
+        var suggestions = document.getElementById(input.getAttribute('data-typeahead-target'));
+
+        function hideSuggestions() {
+            if (suggestions) {
+                suggestions.classList.add('d-none');
+                suggestions.innerHTML = '';
+            }
+        }
+
+        function suggestionItem(text, detail, onSelect) {
+            var item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'list-group-item list-group-item-action d-flex justify-content-between';
+            var label = document.createElement('span');
+            label.textContent = text;
+            item.appendChild(label);
+            if (detail) {
+                var small = document.createElement('small');
+                small.className = 'text-muted';
+                small.textContent = detail;
+                item.appendChild(small);
+            }
+            // mousedown fires before the input's blur hides the list
+            item.addEventListener('mousedown', function(event) {
+                event.preventDefault();
+                onSelect();
+            });
+            return item;
+        }
+
+        function showSuggestions(data) {
+            suggestions.innerHTML = '';
+            data.jobs.forEach(function(job) {
+                suggestions.appendChild(suggestionItem(job.title, 'Job', function() {
+                    window.location.href = job.url;
+                }));
+            });
+            data.skills.forEach(function(skill) {
+                suggestions.appendChild(suggestionItem(skill.name, skill.jobs + ' jobs', function() {
+                    input.value = skill.name;
+                    hideSuggestions();
+                    if (input.form) {
+                        input.form.submit();
+                    }
+                }));
+            });
+            suggestions.classList.toggle('d-none', !suggestions.children.length);
+        }
+
         input.addEventListener('input', function() {
             clearTimeout(timeout);
             timeout = setTimeout(function() {
                 // Trigger search after 500ms of no typing
                 if (input.value.length >= 3 || input.value.length === 0) {
-                    // You can implement live search here
+                    // Only the latest keystroke's request matters; cancel any still in flight
+                    if (controller) {
+                        controller.abort();
+                        controller = null;
+                    }
+                    if (!url || !suggestions || input.value.length === 0) {
+                        hideSuggestions();
+                        return;
+                    }
+                    controller = new AbortController();
+                    fetch(url + '?q=' + encodeURIComponent(input.value), {
+                        signal: controller.signal,
+                        headers: {'Accept': 'application/json'}
+                    })
+                        .then(function(response) { return response.ok ? response.json() : null; })
+                        .then(function(data) {
+                            if (data) {
+                                showSuggestions(data);
+                            }
+                        })
+                        .catch(function(error) {
+                            if (error.name !== 'AbortError') {
+                                hideSuggestions();
+                            }
+                        });
                 }
             }, 500);
         });
+
+        input.addEventListener('blur', hideSuggestions);
+        input.addEventListener('keydown', function(event) {
+            if (event.key === 'Escape') {
+                hideSuggestions();
+            }
+        });
     });
 
     // Confirmation dialogs
@@ -79,6 +161,31 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Select-all checkboxes for bulk actions
+    var selectAllBoxes = document.querySelectorAll('.select-all');
+    selectAllBoxes.forEach(function(box) {
+        box.addEventListener('change', function() {
+            var form = this.closest('form');
+            var targets = form.querySelectorAll('input[type="checkbox"][name="' + this.getAttribute('data-target') + '"]');
+            targets.forEach(function(target) {
+                target.checked = box.checked;
+            });
+        });
+    });
+
+    // Suggested interview slots fill in the date and time fields
+    var slotButtons = document.querySelectorAll('[data-fill-slot-date]');
+    slotButtons.forEach(function(button) {
+        button.addEventListener('click', function() {
+            var dateInput = document.getElementById('scheduled_date');
+            var timeInput = document.getElementById('scheduled_time');
+            if (dateInput && timeInput) {
+                dateInput.value = this.getAttribute('data-fill-slot-date');
+                timeInput.value = this.getAttribute('data-fill-slot-time');
+            }
+        });
+    });
+
     // Status update handling
     var statusSelects = document.querySelectorAll('.status-update-select');
     statusSelects.forEach(function(select) {
@@ -179,6 +286,37 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Unread notification badge: pushed over Server-Sent Events, or polled as JSON
+    var badge = document.getElementById('notification-badge');
+    if (badge) {
+        var showUnread = function(count) {
+            badge.textContent = count > 99 ? '99+' : count;
+            badge.classList.toggle('d-none', !count);
+        };
+        var pollUnread = function() {
+            setInterval(function() {
+                if (document.hidden) return;
+                fetch(badge.getAttribute('data-count-url'), {headers: {'Accept': 'application/json'}})
+                    .then(function(response) { return response.ok ? response.json() : null; })
+                    .then(function(data) { if (data) showUnread(data.unread); })
+                    .catch(function() {});
+            }, 60000);
+        };
+        var streamUrl = badge.getAttribute('data-stream-url');
+        if (streamUrl && window.EventSource) {
+            var source = new EventSource(streamUrl);
+            source.addEventListener('unread', function(event) {
+                showUnread(JSON.parse(event.data).unread);
+            });
+            source.onerror = function() {
+                // Refused (e.g. too many open streams): EventSource gives up, so poll instead
+                if (source.readyState === EventSource.CLOSED) pollUnread();
+            };
+        } else {
+            pollUnread();
+        }
+    }
+
     // Smooth scrolling for anchor links
     var anchorLinks = document.querySelectorAll('a[href^="#"]');
     anchorLinks.forEach(function(link) {
@@ -0,0 +1,424 @@
+import platform
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, insert
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import APPLICATION_STATUSES, Application, Interview, Job, User
+from app.utils.importer import batches, invalidate_caches
+from app.utils.search import rebuild_search_index
+
+BENCH_PASSWORD = 'benchmark'
+HR_EMAIL = 'bench-hr@example.com'
+APPLICANT_EMAIL = 'bench-applicant@example.com'
+
+SENIORITY = ('Junior', 'Senior', 'Lead', 'Principal', 'Staff')
+SPECIALTIES = ('Python', 'Java', 'Data', 'Frontend', 'Backend', 'Cloud', 'Security', 'Mobile', 'QA', 'Platform')
+ROLES = ('Developer', 'Engineer', 'Analyst', 'Architect', 'Manager')
+DEPARTMENTS = ('Engineering', 'Data', 'Finance', 'Marketing', 'Operations', 'Sales', 'HR')
+LOCATIONS = ('New York', 'London', 'Berlin', 'Remote', 'Toronto', 'Singapore')
+JOB_TYPES = ('Full-time', 'Part-time', 'Contract', 'Internship')
+SKILLS = ('python', 'java', 'sql', 'flask', 'django', 'react', 'aws', 'docker', 'kubernetes',
+          'excel', 'tableau', 'spark', 'go', 'typescript', 'terraform', 'linux', 'git', 'pandas')
+INTERVIEW_TYPES = ('in-person', 'video', 'phone')
+
+Scenario = namedtuple('Scenario', 'name role build expected_status')
+
+
+def _words(rng, low, high):
+    return ' '.join(rng.choice(SKILLS + SPECIALTIES) for _ in range(rng.randint(low, high)))
+
+
+def seed_dataset(users=1000, jobs=500, applications=10000, interviews=2000, seed=42, batch_size=1000):
+    """Insert a synthetic dataset with Core bulk inserts; the same seed gives the same rows.
+
+    Adds an HR account and an applicant with no applications (both with
+    BENCH_PASSWORD) for run_benchmark to log in as. Returns the number of
+    rows inserted per table.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    password = generate_password_hash(BENCH_PASSWORD)
+
+    accounts = [
+        {'username': 'bench-hr', 'email': HR_EMAIL, 'role': 'hr', 'first_name': 'Bench', 'last_name': 'Recruiter'},
+        {'username': 'bench-applicant', 'email': APPLICANT_EMAIL, 'role': 'employee', 'first_name': 'Bench',
+         'last_name': 'Applicant', 'skills': 'python, sql, flask'},
+    ]
+    accounts += [{
+        'username': f'bench-candidate-{i}',
+        'email': f'bench-candidate-{i}@example.com',
+        'role': 'employee',
+        'first_name': f'Candidate{i}',
+        'last_name': rng.choice(('Smith', 'Garcia', 'Chen', 'Okafor', 'Novak', 'Patel')),
+        'skills': ', '.join(rng.sample(SKILLS, rng.randint(2, 6))),
+    } for i in range(users)]
+    for account in accounts:
+        account.update(password=password, department=rng.choice(DEPARTMENTS),
+                       location=rng.choice(LOCATIONS), created_at=now)
+    for batch in batches(accounts, batch_size):
+        db.session.execute(insert(User), batch)
+    db.session.commit()
+
+    hr_id = db.session.query(User.id).filter_by(email=HR_EMAIL).scalar()
+    job_rows = []
+    for _ in range(jobs):
+        created_at = now - timedelta(minutes=rng.randint(0, 180 * 24 * 60))
+        job_rows.append({
+            'title': f'{rng.choice(SENIORITY)} {rng.choice(SPECIALTIES)} {rng.choice(ROLES)}',
+            'department': rng.choice(DEPARTMENTS),
+            'location': rng.choice(LOCATIONS),
+            'description': _words(rng, 30, 80),
+            'requirements': _words(rng, 10, 30),
+            'skills_required': ', '.join(rng.sample(SKILLS, rng.randint(2, 5))),
+            'salary_range': f'${rng.randint(50, 120)}k - ${rng.randint(121, 220)}k',
+            'job_type': rng.choice(JOB_TYPES),
+            'status': 'active' if rng.random() < 0.8 else rng.choice(('inactive', 'closed')),
+            'posted_by': hr_id,
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+    for batch in batches(job_rows, batch_size):
+        db.session.execute(insert(Job), batch)
+    db.session.commit()
+
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.posted_by == hr_id)]
+    candidate_ids = [user_id for (user_id,) in db.session.query(User.id)
+                     .filter(User.email.like('bench-candidate-%'))]
+    pairs = set()
+    limit = min(applications, len(job_ids) * len(candidate_ids))
+    while len(pairs) < limit:
+        pairs.add((rng.choice(job_ids), rng.choice(candidate_ids)))
+    application_rows = []
+    for job_id, user_id in sorted(pairs):
+        applied_at = now - timedelta(minutes=rng.randint(0, 120 * 24 * 60))
+        application_rows.append({
+            'job_id': job_id,
+            'user_id': user_id,
+            'status': rng.choice(APPLICATION_STATUSES),
+            'cover_letter': _words(rng, 20, 60),
+            'applied_at': applied_at,
+            'updated_at': applied_at,
+        })
+    for batch in batches(application_rows, batch_size):
+        db.session.execute(insert(Application), batch)
+    db.session.commit()
+
+    application_ids = [application_id for (application_id,) in db.session.query(Application.id)
+                       .filter(Application.job_id.in_(db.session.query(Job.id).filter(Job.posted_by == hr_id)))]
+    interviewers = [f'interviewer{i}@example.com' for i in range(20)]
+    interview_rows = []
+    for application_id in rng.sample(application_ids, min(interviews, len(application_ids))):
+        day = now.date() + timedelta(days=rng.randint(-30, 60))
+        scheduled = datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.randint(9, 16))
+        interview_rows.append({
+            'application_id': application_id,
+            'scheduled_date': scheduled,
+            'duration_minutes': rng.choice((30, 45, 60, 90)),
+            'interview_type': rng.choice(INTERVIEW_TYPES),
+            'interviewer_email': rng.choice(interviewers),
+            'status': 'completed' if scheduled < now else rng.choice(('scheduled', 'scheduled', 'rescheduled')),
+            'created_at': now,
+            'updated_at': now,
+        })
+    for batch in batches(interview_rows, batch_size):
+        db.session.execute(insert(Interview), batch)
+    db.session.commit()
+
+    with db.engine.begin() as connection:
+        rebuild_search_index(connection)
+    invalidate_caches()
+    return {'users': len(accounts), 'jobs': len(job_rows), 'applications': len(application_rows),
+            'interviews': len(interview_rows)}
+
+
+def _job_list(rng, context):
+    return 'GET', '/jobs/list', rng.choice((
+        {'search': 'python'},
+        {'search': 'senior data engineer'},
+        {'search': rng.choice(SKILLS)},
+        {'search': 'cloud', 'location': rng.choice(LOCATIONS)},
+        {'department': rng.choice(DEPARTMENTS)},
+        {'page': rng.randint(1, 5)},
+    ))
+
+
+def _manage_applications(rng, context):
+    return 'GET', '/applications/manage', rng.choice((
+        {},
+        {'status': rng.choice(APPLICATION_STATUSES)},
+        {'job_id': rng.choice(context['job_ids'])},
+    ))
+
+
+def _hr_dashboard(rng, context):
+    return 'GET', '/jobs/hr-dashboard', {}
+
+
+def _interview_list(rng, context):
+    return 'GET', '/interviews/list', rng.choice(({}, {'status': 'scheduled'}, {'status': 'completed'}))
+
+
+def _apply(rng, context):
+    return 'POST', f"/applications/apply/{context['open_jobs'].pop()}", {'cover_letter': _words(rng, 20, 60)}
+
+
+SCENARIOS = (
+    Scenario('job_list', 'applicant', _job_list, 200),
+    Scenario('manage_applications', 'hr', _manage_applications, 200),
+    Scenario('hr_dashboard', 'hr', _hr_dashboard, 200),
+    Scenario('interview_list', 'hr', _interview_list, 200),
+    # Writes last so the read scenarios see the same data on every run
+    Scenario('apply', 'applicant', _apply, 302),
+)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * fraction // 1))
+    return sorted_values[int(rank) - 1]
+
+
+def _request(app, client, method, path, params):
+    # A fresh app context per request, as in production; otherwise requests
+    # made under `flask bench run` share the CLI's context and its cached user
+    with app.app_context():
+        if method == 'GET':
+            return client.get(path, query_string=params)
+        return client.post(path, data=params)
+
+
+def _login(app, email):
+    client = app.test_client()
+    response = _request(app, client, 'POST', '/auth/login', {'email': email, 'password': BENCH_PASSWORD})
+    if response.status_code != 302 or '/auth/login' in response.headers.get('Location', ''):
+        raise RuntimeError(f'Could not log in as {email}; run `flask bench seed` first.')
+    return client
+
+
+def _context(iterations):
+    applicant_id = db.session.query(User.id).filter_by(email=APPLICANT_EMAIL).scalar()
+    # Start every run with the applicant's slate clean so apply always inserts
+    Application.query.filter_by(user_id=applicant_id).delete()
+    db.session.commit()
+    invalidate_caches()
+    open_jobs = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.status == 'active')
+                 .order_by(Job.id.desc()).limit(iterations)]
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).order_by(Job.id).limit(200)]
+    return {'open_jobs': open_jobs, 'job_ids': job_ids}
+
+
+def run_benchmark(app, iterations=50, warmup=5, seed=42, scenarios=None, label=None):
+    """Time each scenario through the test client and return a JSON-serialisable report.
+
+    Every request's latency and SQL statement count is recorded after
+    `warmup` untimed requests; responses with an unexpected status count
+    as errors. Background workers are switched off so they do not add
+    queries or contend for the database.
+    """
+    app.config.update(SKILLS_PIPELINE='none', EMAIL_QUEUE_WORKER='none')
+    selected = [scenario for scenario in SCENARIOS if not scenarios or scenario.name in scenarios]
+    with app.app_context():
+        context = _context(iterations + warmup)
+        clients = {'hr': _login(app, HR_EMAIL), 'applicant': _login(app, APPLICANT_EMAIL)}
+        counts = {
+            'users': db.session.query(func.count(User.id)).scalar(),
+            'jobs': db.session.query(func.count(Job.id)).scalar(),
+            'applications': db.session.query(func.count(Application.id)).scalar(),
+            'interviews': db.session.query(func.count(Interview.id)).scalar(),
+        }
+        engine = db.engine
+        db.session.remove()
+
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    results = {}
+    rng = random.Random(seed)
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        for scenario in selected:
+            client = clients[scenario.role]
+            timings, queries, errors = [], [], 0
+            for number in range(warmup + iterations):
+                if scenario.name == 'apply' and not context['open_jobs']:
+                    errors += 1
+                    continue
+                method, path, params = scenario.build(rng, context)
+                statements[0] = 0
+                started = time.perf_counter()
+                response = _request(app, client, method, path, params)
+                elapsed = time.perf_counter() - started
+                if response.status_code != scenario.expected_status:
+                    errors += 1
+                if number >= warmup:
+                    timings.append(elapsed * 1000)
+                    queries.append(statements[0])
+            timings.sort()
+            results[scenario.name] = {
+                'requests': len(timings),
+                'errors': errors,
+                'mean_ms': round(sum(timings) / len(timings), 3) if timings else None,
+                'p50_ms': _round(percentile(timings, 0.50)),
+                'p90_ms': _round(percentile(timings, 0.90)),
+                'p95_ms': _round(percentile(timings, 0.95)),
+                'p99_ms': _round(percentile(timings, 0.99)),
+                'max_ms': _round(timings[-1] if timings else None),
+                'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+                'queries_max': max(queries) if queries else None,
+            }
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+    return {
+        'label': label,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'database': engine.dialect.name,
+        'dataset': counts,
+        'iterations': iterations,
+        'warmup': warmup,
+        'seed': seed,
+        'scenarios': results,
+    }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def compare_reports(baseline, report, tolerance=0.2):
+    """Return (lines, regressed) comparing p95 latency and query counts per scenario.
+
+    A scenario regresses when its p95 grows by more than `tolerance`
+    (a fraction) or it issues more queries than in the baseline.
+    """
+    lines, regressed = [], False
+    for name, current in report['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous or not previous.get('p95_ms') or current.get('p95_ms') is None:
+            lines.append(f'{name}: no baseline')
+            continue
+        change = current['p95_ms'] / previous['p95_ms'] - 1
+        flags = []
+        if change > tolerance:
+            flags.append('SLOWER')
+        if (current['queries_max'] or 0) > (previous['queries_max'] or 0):
+            flags.append('MORE QUERIES')
+        regressed = regressed or bool(flags)
+        lines.append(f"{name}: p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms ({change:+.0%}), "
+                     f"queries {previous['queries_max']} -> {current['queries_max']}"
+                     + (f"  [{', '.join(flags)}]" if flags else ''))
+    return lines, regressed
+
+
+def _write_worker(args):
+    worker, transactions, seed = args
+    from sqlalchemy.exc import OperationalError
+    from app import create_app
+
+    app = create_app()
+    app.config.update(SKILLS_PIPELINE='none', EMAIL_QUEUE_WORKER='none')
+    rng = random.Random(seed + worker)
+    timings, failures = [], []
+    with app.app_context():
+        application_ids = [application_id for (application_id,) in db.session.query(Application.id)
+                           .join(User, Application.user_id == User.id)
+                           .filter(User.email.like('bench-candidate-%'))]
+        if not application_ids:
+            raise RuntimeError('No benchmark applications; run `flask bench seed` first.')
+        for number in range(transactions):
+            started = time.perf_counter()
+            try:
+                application = db.session.get(Application, rng.choice(application_ids))
+                # The same writes update_status and schedule_interview make
+                if number % 4 == 3:
+                    db.session.add(Interview(
+                        application_id=application.id,
+                        scheduled_date=datetime.utcnow() + timedelta(days=rng.randint(1, 60)),
+                        interviewer_email=f'interviewer{rng.randint(0, 19)}@example.com',
+                        notes='write benchmark'))
+                else:
+                    application.status = rng.choice(APPLICATION_STATUSES)
+                db.session.commit()
+                timings.append((time.perf_counter() - started) * 1000)
+            except OperationalError as e:
+                db.session.rollback()
+                failures.append(str(e.orig))
+    return timings, failures
+
+
+def hammer_writes(processes=4, transactions=200, seed=42):
+    """Commit `transactions` small writes from each of `processes` processes at once.
+
+    Each process builds its own app, like a gunicorn worker. Returns
+    throughput, commit latency percentiles and lock failures.
+    """
+    import multiprocessing
+
+    started = time.perf_counter()
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        results = pool.map(_write_worker, [(worker, transactions, seed) for worker in range(processes)])
+    elapsed = time.perf_counter() - started
+    timings = sorted(timing for worker_timings, _ in results for timing in worker_timings)
+    failures = [failure for _, worker_failures in results for failure in worker_failures]
+    return {
+        'processes': processes,
+        'commits': len(timings),
+        'failures': len(failures),
+        'failure_messages': sorted(set(failures))[:5],
+        'commits_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': _round(percentile(timings, 0.50)),
+        'p95_ms': _round(percentile(timings, 0.95)),
+        'p99_ms': _round(percentile(timings, 0.99)),
+        'max_ms': _round(timings[-1] if timings else None),
+    }
+
+
+_STARTUP_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+connections = []
+event.listen(Pool, 'connect', lambda *args: connections.append(1))
+import app
+imported = time.perf_counter()
+app.create_app()
+built = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'factory_ms': (built - imported) * 1000,
+                  'connections': len(connections)}))
+'''
+
+
+def measure_startup(runs=5):
+    """Time `import app` and create_app() in fresh interpreters, as a worker boot would.
+
+    Also counts database connections opened while building the app,
+    which should be zero. Returns medians over `runs`.
+    """
+    import json
+    import os
+    import statistics
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-W', 'ignore', '-c', _STARTUP_SCRIPT], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'runs': runs,
+        'import_ms': round(statistics.median(sample['import_ms'] for sample in samples), 1),
+        'factory_ms': round(statistics.median(sample['factory_ms'] for sample in samples), 1),
+        'connections': max(sample['connections'] for sample in samples),
+    }
@@ -0,0 +1,50 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+def track_changes(*attributes):
+    """Load an attribute's previous value before it is overwritten.
+
+    Without this, assigning to an attribute expired by a commit records no
+    old value, and attribute_change reports the change as a no-op.
+    """
+    for attribute in attributes:
+        event.listen(attribute, 'set', _load_old_value, active_history=True)
+
+
+def attribute_change(target, name):
+    """Return (old, new) values of an attribute changed in this flush."""
+    history = inspect(target).attrs[name].history
+    new = getattr(target, name)
+    return (history.deleted[0] if history.deleted else new), new
+
+
+class PendingDeltas:
+    """Changes recorded on a session by mapper events, handed to `apply` once the transaction commits.
+
+    Deltas are kept in session.info under `key`; a rollback discards them,
+    so cached counts never reflect writes that did not happen.
+    """
+
+    def __init__(self, key, apply):
+        self.key = key
+        self.apply = apply
+        event.listen(Session, 'after_commit', self._committed)
+        event.listen(Session, 'after_rollback', self._rolled_back)
+
+    def record(self, target, *deltas):
+        session = object_session(target)
+        if session is not None and deltas:
+            session.info.setdefault(self.key, []).extend(deltas)
+
+    def _committed(self, session):
+        deltas = session.info.pop(self.key, None)
+        if deltas:
+            self.apply(deltas)
+
+    def _rolled_back(self, session):
+        session.info.pop(self.key, None)
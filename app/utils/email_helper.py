@@ -1,22 +1,34 @@
-from flask_mail import Message
-from app import mail
 from flask import current_app
+from app.utils.email_queue import enqueue_email, enqueue_emails
+from app.utils.ical import invitation_ics
+from app.utils.metrics import registry
 
-def send_email(to, subject, template, **kwargs):
-    msg = Message(
-        subject=subject,
-        recipients=[to] if isinstance(to, str) else to,
-        html=template,
-        sender=current_app.config['MAIL_DEFAULT_SENDER']
-    )
+def send_email(to, subject, template, attachments=(), **kwargs):
+    # Queued in the outbox by the caller's commit; the outbox worker delivers it with retries
     try:
-        mail.send(msg)
-        return True
+        return enqueue_email(
+            [to] if isinstance(to, str) else to,
+            subject,
+            template,
+            sender=current_app.config['MAIL_DEFAULT_SENDER'],
+            attachments=attachments
+        )
     except Exception as e:
-        print(f"Error sending email: {str(e)}")
+        print(f"Error queueing email: {str(e)}")
+        registry.inc('emails_total', result='queue_error')
         return False
 
-def send_application_status_notification(user_email, job_title, status):
+def send_bulk_emails(messages):
+    # A whole batch of messages built by the *_message helpers, queued by the caller's commit
+    sender = current_app.config['MAIL_DEFAULT_SENDER']
+    try:
+        return enqueue_emails([dict(message, sender=sender) for message in messages])
+    except Exception as e:
+        print(f"Error queueing emails: {str(e)}")
+        registry.inc('emails_total', len(messages), result='queue_error')
+        return 0
+
+def application_status_message(user_email, job_title, status):
     subject = f"Application Status Update - {job_title}"
     template = f"""
     <h2>Application Status Update</h2>
@@ -25,9 +37,14 @@ def send_application_status_notification(user_email, job_title, status):
     <p>Please log in to the TalentBridge portal for more details.</p>
     <p>Best regards,<br>HR Team</p>
     """
-    return send_email(user_email, subject, template)
+    return {'recipients': [user_email], 'subject': subject, 'html': template}
 
-def send_interview_invitation(user_email, job_title, interview_date, interview_type, location_or_link):
+def send_application_status_notification(user_email, job_title, status):
+    message = application_status_message(user_email, job_title, status)
+    return send_email(message['recipients'], message['subject'], message['html'])
+
+def interview_invitation_message(user_email, job_title, interview_date, interview_type, location_or_link,
+                                 interview_id=None, duration_minutes=60, sequence=0):
     subject = f"Interview Invitation - {job_title}"
     template = f"""
     <h2>Interview Invitation</h2>
@@ -42,7 +59,21 @@ def send_interview_invitation(user_email, job_title, interview_date, interview_t
     <p>Please confirm your attendance by logging into the TalentBridge portal.</p>
     <p>Best regards,<br>HR Team</p>
     """
-    return send_email(user_email, subject, template)
+    message = {'recipients': [user_email], 'subject': subject, 'html': template}
+    if interview_id is not None:
+        # Calendar entry for one-click adding; reschedules reuse the UID with a higher SEQUENCE
+        ics = invitation_ics(interview_id, interview_date, duration_minutes, job_title, interview_type,
+                             location_or_link, sequence=sequence)
+        message['attachments'] = [('interview.ics', 'text/calendar', ics)]
+    return message
+
+def send_interview_invitation(user_email, job_title, interview_date, interview_type, location_or_link,
+                              interview_id=None, duration_minutes=60, sequence=0):
+    message = interview_invitation_message(user_email, job_title, interview_date, interview_type, location_or_link,
+                                           interview_id=interview_id, duration_minutes=duration_minutes,
+                                           sequence=sequence)
+    return send_email(message['recipients'], message['subject'], message['html'],
+                      attachments=message.get('attachments', ()))
 
 def send_new_job_notification(user_email, job_title, department):
     subject = f"New Job Opportunity - {job_title}"
@@ -0,0 +1,258 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from flask_mail import Message
+from sqlalchemy import and_, event, func, or_, update
+from sqlalchemy.orm import Session, selectinload
+from app import db, mail
+from app.models import OutboundEmail, OutboundEmailAttachment
+from app.utils.metrics import registry
+from app.utils.timing import timed
+
+
+def enqueue_emails(messages):
+    """Add outgoing emails to the outbox as part of the caller's transaction.
+
+    Nothing is committed here: the messages are stored by the caller's
+    commit (or discarded by its rollback), and the worker is woken once
+    that commit succeeds. Each message is a dict with recipients, subject,
+    html and optionally sender and attachments, a list of (filename,
+    content_type, data) tuples.
+    """
+    with timed('email'):
+        return _enqueue(messages)
+
+
+def _enqueue(messages):
+    now = datetime.utcnow()
+    db.session.add_all([
+        OutboundEmail(
+            recipients=','.join(message['recipients']),
+            subject=message['subject'],
+            html=message['html'],
+            sender=message.get('sender'),
+            status='pending',
+            attempts=0,
+            next_attempt_at=now,
+            attachments=[
+                OutboundEmailAttachment(filename=filename, content_type=content_type,
+                                        data=data.encode('utf-8') if isinstance(data, str) else data)
+                for filename, content_type, data in message.get('attachments', ())
+            ]
+        )
+        for message in messages
+    ])
+    db.session.info['outbox_queued'] = db.session.info.get('outbox_queued', 0) + len(messages)
+    return len(messages)
+
+
+def enqueue_email(recipients, subject, html, sender=None, attachments=()):
+    return enqueue_emails([{'recipients': recipients, 'subject': subject, 'html': html, 'sender': sender,
+                            'attachments': attachments}]) == 1
+
+
+def queue_depth():
+    """Return the number of outbox messages per status."""
+    rows = db.session.query(OutboundEmail.status, func.count()).group_by(OutboundEmail.status).all()
+    return dict(rows)
+
+
+def _claim_batch(batch_size):
+    """Atomically take up to batch_size due messages for this worker."""
+    config = current_app.config
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=config.get('EMAIL_QUEUE_LOCK_TIMEOUT', 300))
+    due = or_(
+        and_(OutboundEmail.status == 'pending', OutboundEmail.next_attempt_at <= now),
+        # Messages held by a worker that died mid-batch
+        and_(OutboundEmail.status == 'sending', OutboundEmail.locked_at < stale)
+    )
+    ids = [row.id for row in db.session.query(OutboundEmail.id).filter(due)
+           .order_by(OutboundEmail.next_attempt_at).limit(batch_size)]
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    db.session.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id.in_(ids), due)
+        .values(status='sending', locked_by=token, locked_at=now)
+    )
+    db.session.commit()
+    return OutboundEmail.query.filter_by(locked_by=token, status='sending')\
+                              .options(selectinload(OutboundEmail.attachments)).all()
+
+
+def _message(email):
+    message = Message(
+        subject=email.subject,
+        recipients=email.recipients.split(','),
+        html=email.html,
+        sender=email.sender or current_app.config['MAIL_DEFAULT_SENDER']
+    )
+    for attachment in email.attachments:
+        message.attach(attachment.filename, attachment.content_type, attachment.data)
+    return message
+
+
+def _mark_failed(email, error):
+    config = current_app.config
+    email.attempts += 1
+    email.last_error = str(error)
+    email.locked_by = None
+    if email.attempts >= config.get('EMAIL_MAX_ATTEMPTS', 5):
+        email.status = 'dead'
+    else:
+        backoff = config.get('EMAIL_RETRY_BACKOFF', 30) * 2 ** (email.attempts - 1)
+        email.status = 'pending'
+        email.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff)
+
+
+def drain_outbox(batch_size=None):
+    """Send one batch of due messages over a single SMTP connection.
+
+    Returns the number of messages claimed.
+    """
+    if batch_size is None:
+        batch_size = current_app.config.get('EMAIL_QUEUE_BATCH_SIZE', 50)
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return 0
+
+    # Outcomes are written after the SMTP session, so no flush can fail halfway through it
+    sent, failed = [], []
+    try:
+        with mail.connect() as connection:
+            for email in batch:
+                try:
+                    with timed('email'):
+                        connection.send(_message(email))
+                except Exception as e:
+                    current_app.logger.warning(f'Error sending email {email.id}: {e}')
+                    failed.append((email, e))
+                else:
+                    sent.append(email)
+    except Exception as e:
+        # Could not open (or cleanly close) the SMTP connection
+        current_app.logger.warning(f'Error connecting to mail server: {e}')
+        done = {email.id for email in sent} | {email.id for email, _ in failed}
+        failed += [(email, e) for email in batch if email.id not in done]
+
+    try:
+        now = datetime.utcnow()
+        for email in sent:
+            email.status = 'sent'
+            email.sent_at = now
+            email.locked_by = None
+        for email, error in failed:
+            _mark_failed(email, error)
+        db.session.commit()
+    except Exception:
+        # The batch stays claimed and is retried once its lock goes stale
+        db.session.rollback()
+        raise
+    registry.inc('emails_total', len(sent), result='sent')
+    registry.inc('emails_total', len(failed), result='send_error')
+    return len(batch)
+
+
+def requeue_dead():
+    """Move dead-lettered messages back to the queue. Returns how many were requeued."""
+    count = OutboundEmail.query.filter_by(status='dead').update(
+        {'status': 'pending', 'attempts': 0, 'next_attempt_at': datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+    return count
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox whenever it is woken or polled."""
+
+    def __init__(self, app):
+        self.app = app
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name='outbox-worker', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopping = True
+        self.wakeup.set()
+        self.thread.join()
+
+    def run(self):
+        interval = self.app.config.get('EMAIL_QUEUE_POLL_INTERVAL', 5)
+        batch_size = self.app.config.get('EMAIL_QUEUE_BATCH_SIZE', 50)
+        # Drain straight away: messages left pending by a previous process are due now
+        while not self.stopping:
+            with self.app.app_context():
+                try:
+                    while drain_outbox(batch_size) == batch_size:
+                        pass
+                except Exception:
+                    self.app.logger.exception('Outbox worker failed to drain the queue')
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self.wakeup.wait(interval)
+            self.wakeup.clear()
+
+
+# One worker thread per process, started on the process's first request so it
+# is created after a gunicorn fork
+_worker = None
+_worker_pid = None
+_worker_lock = threading.Lock()
+
+
+def start_worker(app):
+    global _worker, _worker_pid
+    if app.config.get('EMAIL_QUEUE_WORKER', 'thread') != 'thread':
+        return None
+    if _worker_pid != os.getpid():
+        with _worker_lock:
+            if _worker_pid != os.getpid():
+                _worker = OutboxWorker(app)
+                _worker_pid = os.getpid()
+                _worker.start()
+    return _worker
+
+
+def stop_worker():
+    global _worker, _worker_pid
+    with _worker_lock:
+        if _worker is not None and _worker_pid == os.getpid():
+            _worker.stop()
+        _worker = _worker_pid = None
+
+
+def notify_worker():
+    worker = start_worker(current_app._get_current_object())
+    if worker is not None:
+        worker.wakeup.set()
+
+
+def init_email_queue(app):
+    """Run the outbox worker in every process that serves requests (EMAIL_QUEUE_WORKER='thread')."""
+    @app.before_request
+    def ensure_outbox_worker():
+        start_worker(app)
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_worker(session):
+    queued = session.info.pop('outbox_queued', 0)
+    if queued:
+        registry.inc('emails_total', queued, result='queued')
+        if has_app_context():
+            notify_worker()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_queued(session):
+    session.info.pop('outbox_queued', None)
@@ -0,0 +1,90 @@
+import os
+import time
+import weakref
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from app.utils.metrics import registry
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            registry.inc('db_pool_checkout_timeouts_total')
+            raise
+        registry.observe('db_pool_checkout_wait_seconds', time.perf_counter() - started)
+        return connection
+
+
+def database_uri(uri):
+    # Heroku-style URLs use the scheme SQLAlchemy dropped in 1.4
+    if uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def engine_options(config):
+    """SQLAlchemy engine options for the configured database.
+
+    Server databases get a sized, pre-pinged, recycled connection pool;
+    SQLite keeps the defaults and is tuned with pragmas on connect (see
+    configure_engine). Options set in SQLALCHEMY_ENGINE_OPTIONS win.
+    """
+    # In-memory SQLite is switched to a StaticPool by Flask-SQLAlchemy
+    options = {'poolclass': TimedQueuePool}
+    if not config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+            pool_recycle=config['DB_POOL_RECYCLE'],
+            pool_pre_ping=True,
+        )
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def sqlite_pragmas(config):
+    return (
+        # Wait for the write lock instead of failing with "database is locked"
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        # Readers no longer block the writer (and vice versa); only writers queue
+        ('journal_mode', 'WAL'),
+        # Durable across application crashes; fsync only at checkpoints in WAL mode
+        ('synchronous', 'NORMAL'),
+        # Negative cache_size is in KiB
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        ('temp_store', 'MEMORY'),
+    )
+
+
+def configure_engine(engine, config):
+    """Make `engine` fork-safe and apply the SQLite pragmas to its new connections."""
+    # With gunicorn --preload the app (and engine) is built before forking; a
+    # child must open its own connections rather than share the parent's sockets
+    engine_ref = weakref.ref(engine)
+
+    def _dispose_after_fork():
+        forked_engine = engine_ref()
+        if forked_engine is not None:
+            forked_engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
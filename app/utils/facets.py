@@ -0,0 +1,113 @@
+import threading
+from collections import Counter
+from sqlalchemy import event, func, literal, select, union_all
+from app import db
+from app.models import Job
+from app.utils.cache import TTLCache
+from app.utils.deltas import PendingDeltas, attribute_change, track_changes
+
+FACETS = ('department', 'location', 'job_type')
+FACETS_TTL = 300
+
+_cache = TTLCache(ttl=FACETS_TTL, maxsize=1)
+_lock = threading.Lock()
+
+
+class JobFacets:
+    """Active-job counts per department, location and job type."""
+
+    def __init__(self, counts):
+        self.counts = counts
+
+    def values(self, facet):
+        """Return [(value, active job count)] sorted by value, skipping empty ones."""
+        return sorted(((value, n) for value, n in self.counts[facet].items() if value and n > 0),
+                      key=lambda item: item[0].lower())
+
+    @property
+    def departments(self):
+        return self.values('department')
+
+    @property
+    def locations(self):
+        return self.values('location')
+
+    @property
+    def job_types(self):
+        return self.values('job_type')
+
+    def to_dict(self):
+        return {facet: [{'value': value, 'count': n} for value, n in self.values(facet)]
+                for facet in FACETS}
+
+    def apply(self, deltas):
+        """Return a copy with the deltas applied; cached facets are shared between threads and never mutated."""
+        facets = JobFacets({facet: counts.copy() for facet, counts in self.counts.items()})
+        for facet, value, n in deltas:
+            facets.counts[facet][value] += n
+        return facets
+
+
+def compute_facets():
+    """Count active jobs per facet value with a single grouped query."""
+    active = Job.status == 'active'
+    queries = [
+        select(literal(facet).label('facet'), getattr(Job, facet).label('value'), func.count().label('n'))
+        .where(active).group_by(getattr(Job, facet))
+        for facet in FACETS
+    ]
+    facets = JobFacets({facet: Counter() for facet in FACETS})
+    for facet, value, n in db.session.execute(union_all(*queries)):
+        facets.counts[facet][value] += n
+    return facets
+
+
+def get_job_facets():
+    return _cache.get_or_set('facets', compute_facets)
+
+
+def invalidate_facets():
+    _cache.clear()
+
+
+# Job writes record facet deltas on the session; they are applied to the
+# cached counts after commit, like the dashboard stats.
+
+def _apply_deltas(deltas):
+    with _lock:
+        facets = _cache.get('facets')
+        if facets is not None:
+            _cache.replace('facets', facets.apply(deltas))
+
+
+_pending = PendingDeltas('facet_deltas', _apply_deltas)
+track_changes(Job.status, *(getattr(Job, facet) for facet in FACETS))
+
+
+def _deltas(values, n):
+    return [(facet, values[facet], n) for facet in FACETS]
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    if target.status == 'active':
+        _pending.record(target, *_deltas({facet: getattr(target, facet) for facet in FACETS}, 1))
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    changes = {name: attribute_change(target, name) for name in ('status',) + FACETS}
+    if all(old == new for old, new in changes.values()):
+        return
+    deltas = []
+    if changes['status'][0] == 'active':
+        deltas += _deltas({facet: changes[facet][0] for facet in FACETS}, -1)
+    if changes['status'][1] == 'active':
+        deltas += _deltas({facet: changes[facet][1] for facet in FACETS}, 1)
+    _pending.record(target, *deltas)
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    if target.status == 'active':
+        _pending.record(target, *_deltas({facet: getattr(target, facet) for facet in FACETS}, -1))
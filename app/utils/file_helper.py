@@ -1,29 +1,205 @@
+import hashlib
+import mimetypes
 import os
-import uuid
-from werkzeug.utils import secure_filename
-from flask import current_app
+import tempfile
+import time
+from werkzeug.utils import safe_join, secure_filename, send_file
+from flask import abort, current_app, make_response, request
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app import db
+from app.models import StoredFile
+from app.utils.metrics import registry
+
+CHUNK_SIZE = 64 * 1024
 
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def _stream_to_temp(stream, upload_folder):
+    """Copy an upload to a temp file in chunks, hashing as it goes. Returns (path, sha256, size)."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=upload_folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                temp_file.write(chunk)
+                size += len(chunk)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _change_refs(stored_file, delta):
+    # Relative UPDATE so concurrent requests don't lose each other's changes
+    StoredFile.query.filter_by(id=stored_file.id).update(
+        {'ref_count': StoredFile.ref_count + delta}, synchronize_session=False
+    )
+    db.session.refresh(stored_file)
+
+def _insert_ignoring_conflicts(model):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect in ('mysql', 'mariadb'):
+        return insert(model).prefix_with('IGNORE')
+    return insert(model)
+
+def _add_stored_file(sha256, **fields):
+    """Insert a StoredFile row, or take the one a concurrent request just inserted for the same content.
+
+    The conflict is skipped inside the caller's transaction (no savepoint,
+    which pysqlite would turn into a commit). Returns (stored_file, created).
+    """
+    result = db.session.execute(_insert_ignoring_conflicts(StoredFile).values(sha256=sha256, **fields))
+    return StoredFile.query.filter_by(sha256=sha256).one(), result.rowcount == 1
+
 def save_uploaded_file(file, upload_folder=None):
+    """Store an upload under a content-addressed name and take a reference to it.
+
+    Re-uploading identical content returns the existing filename instead of
+    writing another copy. The reference is persisted by the caller's commit;
+    if it rolls back instead, a newly written file is removed again.
+    """
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
         if upload_folder is None:
             upload_folder = current_app.config['UPLOAD_FOLDER']
         os.makedirs(upload_folder, exist_ok=True)
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
-        return unique_filename
+        started = time.perf_counter()
+        temp_path, sha256, size = _stream_to_temp(file.stream, upload_folder)
+        registry.inc('upload_bytes_total', size)
+        registry.inc('upload_seconds_total', time.perf_counter() - started)
+
+        stored_file = StoredFile.query.filter_by(sha256=sha256).first()
+        if stored_file is not None and os.path.exists(os.path.join(upload_folder, stored_file.filename)):
+            os.remove(temp_path)
+        else:
+            created = False
+            if stored_file is None:
+                stored_file, created = _add_stored_file(sha256, filename=f"{sha256[:32]}_{filename}",
+                                                        size=size, ref_count=0)
+            file_path = os.path.join(upload_folder, stored_file.filename)
+            os.replace(temp_path, file_path)
+            if created:
+                db.session.info.setdefault('files_written', []).append(file_path)
+        _change_refs(stored_file, 1)
+        return stored_file.filename
     return None
 
+def retain_file(filename, upload_folder=None):
+    """Take another reference to an already stored file (e.g. reusing the profile resume).
+
+    Returns the filename to store, which differs from `filename` when a
+    legacy file has the same content as a file that is already stored.
+    """
+    if upload_folder is None:
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+    stored_file = StoredFile.query.filter_by(filename=filename).first()
+    if stored_file is None:
+        # Uploaded before content addressing. Identical content that is already stored is
+        # shared; otherwise the file is registered and its existing owner holds one reference
+        file_path = os.path.join(upload_folder, filename)
+        if not os.path.exists(file_path):
+            return None
+        sha256 = _hash_file(file_path)
+        stored_file = StoredFile.query.filter_by(sha256=sha256).first()
+        if stored_file is None:
+            stored_file, _ = _add_stored_file(sha256, filename=filename, size=os.path.getsize(file_path),
+                                              ref_count=1)
+    _change_refs(stored_file, 1)
+    return stored_file.filename
+
 def delete_file(filename, upload_folder=None):
+    """Drop a reference to a stored file; the file is unlinked after commit once unreferenced."""
     if upload_folder is None:
         upload_folder = current_app.config['UPLOAD_FOLDER']
     file_path = os.path.join(upload_folder, filename)
+    stored_file = StoredFile.query.filter_by(filename=filename).first()
+    if stored_file is not None:
+        _change_refs(stored_file, -1)
+        if stored_file.ref_count > 0:
+            return False
+        db.session.delete(stored_file)
     if os.path.exists(file_path):
-        os.remove(file_path)
+        db.session.info.setdefault('files_to_unlink', []).append(file_path)
         return True
     return False
+
+def _download_name(filename):
+    # Stored names are '<32 hex chars>_<original name>'
+    prefix, _, original = filename.partition('_')
+    return original if len(prefix) == 32 and original else filename
+
+def send_resume(filename, upload_folder=None, immutable=False):
+    """Serve a stored resume to an already authorized user.
+
+    Responses carry a content-hash ETag and are revalidated on every use,
+    since a URL like /profile/resume can start serving a different file.
+    Pass `immutable` only for URLs that name the file itself; those get a
+    long private cache lifetime instead. With RESUME_SENDFILE set to 'x-accel-redirect'
+    or 'x-sendfile' the transfer is handed to the front-end server; otherwise
+    Werkzeug serves it with Range/conditional support through the WSGI file
+    wrapper (sendfile under gunicorn).
+    """
+    if upload_folder is None:
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+    file_path = safe_join(os.path.abspath(upload_folder), filename)
+    if file_path is None or not os.path.isfile(file_path):
+        abort(404)
+
+    stored_file = StoredFile.query.filter_by(filename=filename).first()
+    etag = stored_file.sha256 if stored_file is not None else True
+    max_age = current_app.config.get('RESUME_CACHE_MAX_AGE', 31536000) if immutable else None
+    mode = (current_app.config.get('RESUME_SENDFILE') or '').lower()
+
+    if mode == 'x-accel-redirect':
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = current_app.config['RESUME_ACCEL_REDIRECT_PREFIX'] + filename
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response.headers.set('Content-Disposition', 'inline', filename=_download_name(filename))
+        if stored_file is not None:
+            response.set_etag(stored_file.sha256)
+    else:
+        response = send_file(file_path, request.environ, download_name=_download_name(filename),
+                             conditional=True, etag=etag, max_age=max_age,
+                             use_x_sendfile=mode == 'x-sendfile',
+                             response_class=current_app.response_class)
+
+    response.cache_control.public = False
+    response.cache_control.private = True
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@event.listens_for(Session, 'after_commit')
+def _unlink_released_files(session):
+    session.info.pop('files_written', None)
+    for file_path in session.info.pop('files_to_unlink', []):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+@event.listens_for(Session, 'after_rollback')
+def _keep_released_files(session):
+    session.info.pop('files_to_unlink', None)
+    # Their StoredFile rows were rolled back, so nothing refers to these files
+    for file_path in session.info.pop('files_written', []):
+        if os.path.exists(file_path):
+            os.remove(file_path)
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+PRODID = '-//TalentBridge//Interviews//EN'
+UID_DOMAIN = 'talentbridge'
+
+# Schedules are entered as wall-clock times without a zone, so events use
+# floating times and show at the same clock time in every client.
+_LOCAL_FORMAT = '%Y%m%dT%H%M%S'
+_UTC_FORMAT = '%Y%m%dT%H%M%SZ'
+
+
+def escape(value):
+    """Escape a TEXT property value (RFC 5545 section 3.3.11)."""
+    return (str(value or '').replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold(line):
+    """Fold a content line at 75 octets with CRLF + space continuations."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def interview_uid(interview_id):
+    return f'interview-{interview_id}@{UID_DOMAIN}'
+
+
+def event_lines(uid, start, duration_minutes, summary, location=None, description=None,
+                status='scheduled', sequence=0, stamp=None):
+    """Yield the folded lines of one VEVENT."""
+    end = start + timedelta(minutes=duration_minutes or 60)
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f"DTSTAMP:{(stamp or datetime.utcnow()).strftime(_UTC_FORMAT)}",
+        f'DTSTART:{start.strftime(_LOCAL_FORMAT)}',
+        f'DTEND:{end.strftime(_LOCAL_FORMAT)}',
+        f'SEQUENCE:{sequence}',
+        f'SUMMARY:{escape(summary)}',
+        'STATUS:CANCELLED' if status == 'cancelled' else 'STATUS:CONFIRMED',
+    ]
+    if location:
+        lines.append(f'LOCATION:{escape(location)}')
+    if description:
+        lines.append(f'DESCRIPTION:{escape(description)}')
+    lines.append('END:VEVENT')
+    for line in lines:
+        yield fold(line)
+
+
+def calendar_lines(events, name=None, method=None):
+    """Yield a whole VCALENDAR around an iterable of event line iterables, one event at a time."""
+    yield fold('BEGIN:VCALENDAR')
+    yield fold('VERSION:2.0')
+    yield fold(f'PRODID:{PRODID}')
+    yield fold('CALSCALE:GREGORIAN')
+    if method:
+        yield fold(f'METHOD:{method}')
+    if name:
+        yield fold(f'X-WR-CALNAME:{escape(name)}')
+    for event in events:
+        yield from event
+    yield fold('END:VCALENDAR')
+
+
+def interview_sequence(created_at, updated_at):
+    """Increasing SEQUENCE for an interview: seconds between creation and last change."""
+    if not created_at or not updated_at or updated_at <= created_at:
+        return 0
+    return max(1, int((updated_at - created_at).total_seconds()))
+
+
+def interview_event(interview_id, start, duration_minutes, job_title, interview_type, location_or_link,
+                    status='scheduled', sequence=0, notes=None, candidate_name=None, stamp=None):
+    summary = f'Interview: {job_title}'
+    if candidate_name:
+        summary += f' - {candidate_name}'
+    description = f"{(interview_type or 'interview').title()} interview"
+    if notes:
+        description += f'\n\n{notes}'
+    return event_lines(interview_uid(interview_id), start, duration_minutes, summary,
+                       location=location_or_link, description=description, status=status,
+                       sequence=sequence, stamp=stamp)
+
+
+def invitation_ics(interview_id, start, duration_minutes, job_title, interview_type, location_or_link,
+                   sequence=0):
+    """Return a single-event calendar (METHOD:PUBLISH) to attach to an invitation email."""
+    event = interview_event(interview_id, start, duration_minutes, job_title, interview_type,
+                            location_or_link, sequence=sequence)
+    return ''.join(calendar_lines([event], method='PUBLISH'))
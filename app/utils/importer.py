@@ -0,0 +1,293 @@
+import csv
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import insert, tuple_
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import APPLICATION_STATUSES, Application, Job, User
+
+ROLES = ('employee', 'hr', 'manager')
+JOB_STATUSES = ('active', 'inactive', 'closed')
+
+
+class ImportReport:
+    """Counts and timing for one import run, reported after every batch."""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.started = time.monotonic()
+        self.read = 0
+        self.inserted = 0
+        self.skipped = []
+
+    def skip(self, line, reason):
+        self.skipped.append((line, reason))
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def batch_done(self):
+        if self.callback:
+            self.callback(self)
+
+
+def read_records(path):
+    """Yield (line number, dict) from a CSV, JSON array or JSON-lines file."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if extension == '.csv':
+            for number, row in enumerate(csv.DictReader(f), 2):
+                yield number, {key.strip(): (value.strip() if isinstance(value, str) else value)
+                               for key, value in row.items() if key}
+        elif extension == '.json':
+            for number, record in enumerate(json.load(f), 1):
+                yield number, record
+        elif extension in ('.jsonl', '.ndjson'):
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield number, json.loads(line)
+        else:
+            raise ValueError(f'Unsupported file type: {extension or path}')
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def invalidate_caches():
+    """Drop in-process caches that ORM events would have updated.
+
+    Core bulk inserts bypass mapper events, so callers run this after
+    an import. The job search index and skill vectors are rebuilt
+    separately.
+    """
+    from app.utils.facets import invalidate_facets
+    from app.utils.pagination import invalidate_totals
+    from app.utils.stats import invalidate_stats
+    from app.utils.typeahead import invalidate_index
+    invalidate_stats()
+    invalidate_totals()
+    invalidate_facets()
+    invalidate_index()
+
+
+def _date(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    for pattern in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(str(value), pattern)
+        except ValueError:
+            continue
+    raise ValueError(f'invalid date {value!r}')
+
+
+def _missing(record, fields):
+    return [field for field in fields if not record.get(field)]
+
+
+def import_jobs(records, posted_by, batch_size=1000, report=None):
+    """Insert job records with one executemany INSERT and one commit per batch."""
+    report = report or ImportReport()
+    for batch in batches(records, batch_size):
+        rows = []
+        for line, record in batch:
+            report.read += 1
+            missing = _missing(record, ('title', 'department', 'location', 'description'))
+            if missing:
+                report.skip(line, f"missing {', '.join(missing)}")
+                continue
+            status = record.get('status') or 'active'
+            if status not in JOB_STATUSES:
+                report.skip(line, f'unknown status {status!r}')
+                continue
+            try:
+                deadline = _date(record.get('deadline'))
+                created_at = _date(record.get('created_at')) or datetime.utcnow()
+            except ValueError as e:
+                report.skip(line, str(e))
+                continue
+            rows.append({
+                'title': record['title'],
+                'department': record['department'],
+                'location': record['location'],
+                'description': record['description'],
+                'requirements': record.get('requirements') or None,
+                'skills_required': record.get('skills_required') or None,
+                'salary_range': record.get('salary_range') or None,
+                'job_type': record.get('job_type') or 'Full-time',
+                'status': status,
+                'deadline': deadline,
+                'posted_by': posted_by,
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+        if rows:
+            db.session.execute(insert(Job), rows)
+            db.session.commit()
+            report.inserted += len(rows)
+        report.batch_done()
+    return report
+
+
+def _unique_username(base, taken):
+    """`base`, or `base` with the first numeric suffix that is not in `taken` (lowercased)."""
+    username = base
+    suffix = 1
+    while username.lower() in taken:
+        suffix += 1
+        username = f'{base}{suffix}'
+    return username
+
+
+def _hash_password(password):
+    return generate_password_hash(password)
+
+
+def import_users(records, batch_size=1000, workers=None, report=None):
+    """Insert user records in batches, hashing passwords on a process pool.
+
+    Records carry either a plain `password` (hashed here) or an existing
+    werkzeug `password_hash`. Records with neither get a random password
+    and must reset it before logging in. Emails and usernames that
+    already exist are skipped; a username derived from the email gets a
+    numeric suffix instead.
+    """
+    report = report or ImportReport()
+    emails = {email.lower() for (email,) in db.session.query(User.email)}
+    usernames = {username.lower() for (username,) in db.session.query(User.username)}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batches(records, batch_size):
+            rows = []
+            plain = []
+            for line, record in batch:
+                report.read += 1
+                missing = _missing(record, ('email', 'first_name', 'last_name'))
+                if missing:
+                    report.skip(line, f"missing {', '.join(missing)}")
+                    continue
+                invalid = [field for field in ('email', 'username', 'first_name', 'last_name')
+                           if record.get(field) is not None and not isinstance(record[field], str)]
+                if invalid:
+                    report.skip(line, f"{', '.join(invalid)} must be text")
+                    continue
+                email = record['email'].strip()
+                role = record.get('role') or 'employee'
+                if role not in ROLES:
+                    report.skip(line, f'unknown role {role!r}')
+                    continue
+                if email.lower() in emails:
+                    report.skip(line, f'email {email} already exists')
+                    continue
+                if record.get('username'):
+                    username = record['username'].strip()
+                    if username.lower() in usernames:
+                        report.skip(line, f'username {username} already exists')
+                        continue
+                else:
+                    username = _unique_username(email.split('@')[0], usernames)
+                emails.add(email.lower())
+                usernames.add(username.lower())
+                rows.append({
+                    'username': username,
+                    'email': email,
+                    'password': record.get('password_hash'),
+                    'role': role,
+                    'first_name': record['first_name'],
+                    'last_name': record['last_name'],
+                    'department': record.get('department') or None,
+                    'location': record.get('location') or None,
+                    'phone': record.get('phone') or None,
+                    'skills': record.get('skills') or None,
+                })
+                if not record.get('password_hash'):
+                    plain.append((len(rows) - 1, record.get('password') or secrets.token_urlsafe(16)))
+
+            # Hashing dominates the import; spread it over every core
+            hashes = pool.map(_hash_password, [password for _, password in plain],
+                              chunksize=max(1, len(plain) // (4 * (workers or os.cpu_count() or 1))))
+            for (index, _), password_hash in zip(plain, hashes):
+                rows[index]['password'] = password_hash
+
+            if rows:
+                db.session.execute(insert(User), rows)
+                db.session.commit()
+                report.inserted += len(rows)
+            report.batch_done()
+    return report
+
+
+def import_applications(records, batch_size=1000, report=None):
+    """Insert applications keyed by candidate email (or user_id) and job_id.
+
+    Existing (job, candidate) pairs are skipped, so re-running an import
+    file only adds what is new.
+    """
+    report = report or ImportReport()
+    users = {email.lower(): user_id for user_id, email in db.session.query(User.id, User.email)}
+    user_ids = set(users.values())
+    jobs = {job_id for (job_id,) in db.session.query(Job.id)}
+
+    for batch in batches(records, batch_size):
+        rows = {}
+        for line, record in batch:
+            report.read += 1
+            try:
+                user_id = users.get(str(record.get('email') or '').strip().lower())
+                if user_id is None and record.get('user_id'):
+                    user_id = int(record['user_id'])
+                job_id = int(record.get('job_id') or 0)
+                applied_at = _date(record.get('applied_at')) or datetime.utcnow()
+            except ValueError as e:
+                report.skip(line, str(e))
+                continue
+            if user_id not in user_ids:
+                report.skip(line, 'unknown candidate')
+                continue
+            if job_id not in jobs:
+                report.skip(line, f'unknown job {record.get("job_id")!r}')
+                continue
+            status = record.get('status') or 'submitted'
+            if status not in APPLICATION_STATUSES:
+                report.skip(line, f'unknown status {status!r}')
+                continue
+            if (job_id, user_id) in rows:
+                report.skip(line, 'duplicate application in file')
+                continue
+            rows[(job_id, user_id)] = {
+                'job_id': job_id,
+                'user_id': user_id,
+                'status': status,
+                'cover_letter': record.get('cover_letter') or None,
+                'applied_at': applied_at,
+                'updated_at': applied_at,
+            }
+
+        if rows:
+            existing = set(db.session.query(Application.job_id, Application.user_id)
+                           .filter(tuple_(Application.job_id, Application.user_id).in_(list(rows))))
+            for pair in existing:
+                rows.pop(pair)
+            report.skipped.extend((None, f'job {job_id} / user {user_id} already applied')
+                                  for job_id, user_id in existing)
+        if rows:
+            db.session.execute(insert(Application), list(rows.values()))
+            db.session.commit()
+            report.inserted += len(rows)
+        report.batch_done()
+    return report
@@ -0,0 +1,225 @@
+import glob
+import json
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# name: (type, help, buckets)
+METRICS = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint.', LATENCY_BUCKETS),
+    'http_requests_total': ('counter', 'Requests by endpoint and status code.', None),
+    'db_pool_checkout_wait_seconds': ('histogram', 'Time to get a connection from the pool.', WAIT_BUCKETS),
+    'db_pool_checkout_timeouts_total': ('counter', 'Pool checkouts that gave up waiting.', None),
+    'db_pool_checked_out': ('gauge', 'Connections currently in use.', None),
+    'db_pool_size': ('gauge', 'Connections the pool keeps open.', None),
+    'db_pool_overflow': ('gauge', 'Connections open beyond the pool size.', None),
+    'upload_bytes_total': ('counter', 'Bytes received by save_uploaded_file.', None),
+    'upload_seconds_total': ('counter', 'Time spent receiving uploads.', None),
+    'emails_total': ('counter', 'Emails by result (queued, queue_error, sent, send_error).', None),
+    'fragment_cache_hits_total': ('counter', 'Rendered job fragments served from cache.', None),
+    'fragment_cache_misses_total': ('counter', 'Job fragments rendered afresh.', None),
+    'email_queue_depth': ('gauge', 'Outbox messages by status.', None),
+}
+
+
+class Registry:
+    """Counters, gauges and histograms for one process.
+
+    With a shared `directory`, every process writes its snapshot there
+    (at most once per `flush_interval` seconds) and collect() sums the
+    snapshots, so any gunicorn worker can answer a scrape for all of them.
+    Gauges of processes that have exited are dropped; their counters and
+    histograms are kept so totals never go backwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._collectors = []
+        self.directory = None
+        self.flush_interval = 1.0
+        self._flushed_at = 0.0
+
+    def configure(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def add_collector(self, collector):
+        """Register a callable run before each snapshot to refresh gauges."""
+        self._collectors.append(collector)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # One count per bucket, then +Inf, sum
+                counts = self._values[key] = [0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+
+    def snapshot(self):
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception:
+                pass
+        with self._lock:
+            return [[name, [list(label) for label in labels], value.copy() if isinstance(value, list) else value]
+                    for (name, labels), value in self._values.items()]
+
+    def maybe_flush(self):
+        if not self.directory or time.monotonic() - self._flushed_at < self.flush_interval:
+            return
+        self.flush()
+
+    def flush(self):
+        if not self.directory:
+            return
+        self._flushed_at = time.monotonic()
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+
+    def collect(self):
+        """Merge this process's live values with the other processes' snapshots."""
+        merged = {}
+        sources = [(os.getpid(), self.snapshot())]
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+                pid = int(os.path.basename(path)[len('metrics-'):-len('.json')])
+                if pid == os.getpid():
+                    continue
+                try:
+                    with open(path) as f:
+                        sources.append((pid, json.load(f)))
+                except (OSError, ValueError):
+                    continue
+        for pid, entries in sources:
+            alive = pid == os.getpid() or _process_alive(pid)
+            for name, labels, value in entries:
+                if name not in METRICS or (METRICS[name][0] == 'gauge' and not alive):
+                    continue
+                key = (name, tuple(tuple(label) for label in labels))
+                if isinstance(value, list):
+                    current = merged.get(key)
+                    merged[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(values):
+    """Format merged values in the Prometheus text exposition format."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in values.items() if metric == name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+            cumulative += value[len(buckets)]
+            lines.append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+            lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def init_metrics(app):
+    """Record request latency per endpoint and share snapshots between workers."""
+    import atexit
+    from flask import g, request
+    from app import db
+    from app.utils.page_cache import job_fragments
+
+    registry.configure(app.config.get('METRICS_DIR'), app.config.get('METRICS_FLUSH_INTERVAL', 1.0))
+    with app.app_context():
+        engine = db.engine
+
+    def pool_gauges(registry):
+        # Looked up each time: engine.dispose() (e.g. after a fork) replaces the pool
+        pool = engine.pool
+        if hasattr(pool, 'checkedout'):
+            registry.set('db_pool_checked_out', pool.checkedout())
+        if hasattr(pool, 'size'):
+            registry.set('db_pool_size', pool.size())
+        if hasattr(pool, 'overflow'):
+            registry.set('db_pool_overflow', max(pool.overflow(), 0))
+
+    def fragment_cache(registry):
+        stats = job_fragments.stats()
+        registry.set('fragment_cache_hits_total', stats['hits'])
+        registry.set('fragment_cache_misses_total', stats['misses'])
+
+    registry.add_collector(pool_gauges)
+    registry.add_collector(fragment_cache)
+    atexit.register(registry.flush)
+
+    @app.before_request
+    def start_request_clock():
+        g._request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('_request_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unmatched'
+            registry.observe('http_request_duration_seconds', time.perf_counter() - started, endpoint=endpoint)
+            registry.inc('http_requests_total', endpoint=endpoint, status=response.status_code)
+        registry.maybe_flush()
+        return response
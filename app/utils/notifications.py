@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Notification
+from app.utils.cache import TTLCache
+
+# Writes in this process adjust cached counts immediately; other workers catch up after the TTL
+UNREAD_TTL = 60
+
+_unread = TTLCache(ttl=UNREAD_TTL, maxsize=10000)
+
+
+def notify(notifications):
+    """Add in-app notifications to the current transaction with a single INSERT.
+
+    `notifications` is a list of (user_id, title, message). The caller
+    commits; cached unread counts are adjusted once the commit succeeds.
+    """
+    if not notifications:
+        return 0
+    now = datetime.utcnow()
+    db.session.execute(insert(Notification), [
+        {'user_id': user_id, 'title': title, 'message': message, 'is_read': False, 'created_at': now}
+        for user_id, title, message in notifications
+    ])
+    deltas = db.session.info.setdefault('notification_deltas', Counter())
+    for user_id, _, _ in notifications:
+        deltas[user_id] += 1
+    return len(notifications)
+
+
+def mark_read(user_id, notification_ids=None):
+    """Mark a user's unread notifications (all, or just `notification_ids`) as read; the caller commits."""
+    query = Notification.query.filter(Notification.user_id == user_id, Notification.is_read.is_(False))
+    if notification_ids is not None:
+        query = query.filter(Notification.id.in_(list(notification_ids)))
+    updated = query.update({'is_read': True}, synchronize_session=False)
+    if updated:
+        db.session.info.setdefault('notification_deltas', Counter())[user_id] -= updated
+    return updated
+
+
+def _count_unread(user_id):
+    return db.session.query(func.count(Notification.id)).filter(
+        Notification.user_id == user_id, Notification.is_read.is_(False)
+    ).scalar()
+
+
+def unread_count(user_id, fresh=False):
+    """Unread notifications for a user, counted at most once per UNREAD_TTL unless `fresh`."""
+    if fresh:
+        count = _count_unread(user_id)
+        _unread.set(user_id, count)
+        return count
+    return _unread.get_or_set(user_id, lambda: _count_unread(user_id))
+
+
+def status_notification(user_id, job_title, status):
+    return (user_id, f'Application update: {job_title}',
+            f"Your application for {job_title} is now {status.replace('_', ' ').title()}.")
+
+
+def interview_notification(user_id, job_title, interview_date, rescheduled=False):
+    when = interview_date.strftime('%B %d, %Y at %I:%M %p')
+    if rescheduled:
+        return user_id, f'Interview rescheduled: {job_title}', f'Your interview for {job_title} has moved to {when}.'
+    return user_id, f'Interview scheduled: {job_title}', f'Your interview for {job_title} is on {when}.'
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_deltas(session):
+    deltas = session.info.pop('notification_deltas', None)
+    if not deltas:
+        return
+    for user_id, delta in deltas.items():
+        cached = _unread.get(user_id)
+        if cached is not None:
+            _unread.set(user_id, max(cached + delta, 0))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard(session):
+    session.info.pop('notification_deltas', None)
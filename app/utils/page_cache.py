@@ -0,0 +1,67 @@
+import hashlib
+import threading
+from flask import render_template, request, session
+from markupsafe import Markup
+from app.utils.cache import TTLCache
+
+
+class FragmentCache:
+    """Rendered template fragments keyed by the version of the data they show."""
+
+    def __init__(self, ttl=600, maxsize=2000):
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key, template, **context):
+        html = self._cache.get(key)
+        with self._lock:
+            if html is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if html is None:
+            html = Markup(render_template(template, **context))
+            self._cache.set(key, html)
+        return html
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
+
+    def clear(self):
+        self._cache.clear()
+
+
+# Shared job markup: the detail body and the list cards. Keys include
+# Job.updated_at, so an edited job simply misses and renders afresh.
+job_fragments = FragmentCache()
+
+
+def make_etag(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    """True when the client's cached copy is current.
+
+    Pending flash messages always get a fresh render so they are not lost.
+    """
+    if session.get('_flashes'):
+        return False
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def cache_headers(response, etag, last_modified=None):
+    """Mark a per-user page as revalidate-before-use and attach its validators."""
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
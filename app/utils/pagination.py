@@ -0,0 +1,105 @@
+from flask import current_app, request
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import event
+from app import db
+from app.models import Job, Application, Interview
+from app.utils.cache import TTLCache
+
+# Totals for listing pages only need to be roughly right
+_totals = TTLCache(ttl=60, maxsize=512)
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='pagination-cursor')
+
+
+def encode_cursor(sort_value, row_id):
+    return _serializer().dumps([sort_value.isoformat() if sort_value else None, row_id])
+
+
+def decode_cursor(token, sort_column):
+    """Return the (sort_value, id) pair stored in a cursor, or None if it is invalid."""
+    try:
+        sort_value, row_id = _serializer().loads(token)
+        if sort_value is not None:
+            sort_value = sort_column.type.python_type.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (BadSignature, TypeError, ValueError):
+        return None
+
+
+def cached_total(query, cache_key):
+    """Return a cached COUNT(*) for a listing query."""
+    return _totals.get_or_set(cache_key, lambda: query.order_by(None).count())
+
+
+def invalidate_totals(*args):
+    _totals.clear()
+
+
+# Writes in this process drop cached totals; other workers catch up after the TTL
+for _model in (Job, Application, Interview):
+    for _event in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event, invalidate_totals)
+
+
+class KeysetPagination:
+    """One page of a listing ordered by (sort_column, id), addressed by an opaque cursor."""
+
+    is_keyset = True
+
+    def __init__(self, items, per_page, total, next_cursor, is_first):
+        self.items = items
+        self.per_page = per_page
+        self.total = total
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.is_first = is_first
+
+
+def keyset_paginate(query, sort_column, id_column, after=None, per_page=20, descending=True, total=None):
+    """Fetch the page of `query` that follows the `after` cursor.
+
+    Rows are ordered by (sort_column, id_column) so the page is located
+    with an index range scan instead of an OFFSET.
+    """
+    key = db.tuple_(sort_column, id_column)
+    position = decode_cursor(after, sort_column) if after else None
+    if position is not None:
+        query = query.filter(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return KeysetPagination(rows, per_page, total, next_cursor, is_first=position is None)
+
+
+def paginate_listing(query, sort_column, id_column, cache_key, per_page=20, descending=True):
+    """Paginate a listing by page number for small result sets and by cursor for large ones.
+
+    An `after` cursor always selects keyset mode, and so does the first
+    page of a result set larger than KEYSET_PAGINATION_THRESHOLD. Explicit
+    `page` numbers keep working regardless of size. Totals are cached.
+    """
+    after = request.args.get('after')
+    page = request.args.get('page', type=int)
+    total = cached_total(query, cache_key)
+
+    threshold = current_app.config.get('KEYSET_PAGINATION_THRESHOLD', 1000)
+    if after or (page is None and total > threshold):
+        return keyset_paginate(query, sort_column, id_column, after=after,
+                               per_page=per_page, descending=descending, total=total)
+
+    order = (sort_column.desc(), id_column.desc()) if descending else (sort_column.asc(), id_column.asc())
+    pagination = query.order_by(*order).paginate(page=page or 1, per_page=per_page,
+                                                 error_out=False, count=False)
+    pagination.total = total
+    return pagination
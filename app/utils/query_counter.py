@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if not has_app_context():
+        return
+    for counter in g.get('_query_counters', ()):
+        counter.count += 1
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed inside the block (requires an app context)."""
+    counter = QueryCounter()
+    counters = g.setdefault('_query_counters', [])
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+
+def query_budget(limit):
+    """Limit the number of SQL statements a view may issue, including template rendering.
+
+    Over-budget requests raise QueryBudgetExceeded when QUERY_BUDGET_STRICT
+    is set (the default under TESTING) and are logged otherwise.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with count_queries() as counter:
+                response = view(*args, **kwargs)
+            if counter.count > limit:
+                message = f'{view.__name__} issued {counter.count} queries (budget {limit})'
+                if current_app.config.get('QUERY_BUDGET_STRICT', current_app.testing):
+                    raise QueryBudgetExceeded(message + ':\n' + '\n'.join(counter.statements))
+                current_app.logger.warning(message)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,40 @@
+import os
+import zipfile
+from xml.etree import ElementTree
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _pdf_text(path):
+    # Imported on first use; it is slow to import and most requests never read a PDF
+    try:
+        from pypdf import PdfReader
+    except ImportError:  # text extraction from PDFs is skipped without pypdf
+        return ''
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _docx_text(path):
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{_WORD_NS}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{_WORD_NS}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract_text(path):
+    """Return the plain text of a PDF or DOCX resume, or '' if it cannot be read.
+
+    Legacy binary .doc files are not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == '.pdf':
+            return _pdf_text(path)
+        if extension == '.docx':
+            return _docx_text(path)
+    except Exception as e:
+        print(f"Error extracting text from {os.path.basename(path)}: {str(e)}")
+    return ''
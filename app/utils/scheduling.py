@@ -0,0 +1,128 @@
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from app import db
+from app.models import Application, Interview
+
+# Interviews in these states block the interviewer's and candidate's time
+ACTIVE_STATUSES = ('scheduled', 'rescheduled')
+
+# Upper bound on duration_minutes; lets overlap checks stay an index range scan
+MAX_INTERVIEW_MINUTES = 240
+
+WORKDAY_START = time(9, 0)
+WORKDAY_END = time(17, 0)
+
+Booking = namedtuple('Booking', 'interview_id start end interviewer_email user_id')
+
+
+def bookings(start, end, interviewer_email=None, candidate_ids=None, exclude_id=None):
+    """Return active interviews overlapping [start, end) for an interviewer and/or candidates.
+
+    Only rows starting in [start - MAX_INTERVIEW_MINUTES, end) can overlap,
+    so each lookup is a range scan on (interviewer_email, scheduled_date) or
+    on the candidate's interviews rather than a scan of every interview.
+    """
+    lower = start - timedelta(minutes=MAX_INTERVIEW_MINUTES)
+    base = db.session.query(
+        Interview.id, Interview.scheduled_date, Interview.duration_minutes,
+        Interview.interviewer_email, Application.user_id
+    ).join(Application, Interview.application_id == Application.id).filter(
+        Interview.status.in_(ACTIVE_STATUSES),
+        Interview.scheduled_date >= lower,
+        Interview.scheduled_date < end
+    )
+    if exclude_id is not None:
+        base = base.filter(Interview.id != exclude_id)
+
+    rows = {}
+    if interviewer_email:
+        rows.update((row[0], row) for row in base.filter(Interview.interviewer_email == interviewer_email))
+    if candidate_ids:
+        rows.update((row[0], row) for row in base.filter(Application.user_id.in_(list(candidate_ids))))
+
+    result = []
+    for interview_id, scheduled_date, duration, email, user_id in rows.values():
+        booking_end = scheduled_date + timedelta(minutes=duration or 60)
+        if booking_end > start:
+            result.append(Booking(interview_id, scheduled_date, booking_end, email, user_id))
+    return sorted(result, key=lambda booking: booking.start)
+
+
+def overlapping(booked, start, end):
+    return [booking for booking in booked if booking.start < end and booking.end > start]
+
+
+def find_conflicts(start, duration, interviewer_email=None, candidate_id=None, exclude_id=None):
+    """Return the bookings that clash with a new interview at `start` for `duration` minutes."""
+    end = start + timedelta(minutes=duration)
+    return bookings(start, end, interviewer_email=interviewer_email,
+                    candidate_ids=[candidate_id] if candidate_id else None, exclude_id=exclude_id)
+
+
+def describe_conflicts(conflicts, interviewer_email=None):
+    parts = []
+    for booking in conflicts:
+        who = 'Interviewer' if booking.interviewer_email == interviewer_email else 'Candidate'
+        parts.append(f"{who} is booked {booking.start.strftime('%b %d, %H:%M')}-{booking.end.strftime('%H:%M')}")
+    return '; '.join(parts)
+
+
+def free_slots(interviewer_email, start_date, days=5, duration=60, step=30, candidate_id=None,
+               limit=None, exclude_id=None):
+    """Compute open working-hour windows and bookable start times.
+
+    Busy time for the whole range is loaded with one indexed query per
+    party, merged, and swept once per working day (weekends skipped).
+    Returns (windows, slots): windows as (start, end) pairs and slots as
+    start datetimes on a `step`-minute grid that fit `duration`.
+    """
+    range_start = datetime.combine(start_date, WORKDAY_START)
+    range_end = datetime.combine(start_date + timedelta(days=days - 1), WORKDAY_END)
+    busy = bookings(range_start, range_end, interviewer_email=interviewer_email,
+                    candidate_ids=[candidate_id] if candidate_id else None, exclude_id=exclude_id)
+
+    merged = []
+    for booking in busy:
+        if merged and booking.start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], booking.end)
+        else:
+            merged.append([booking.start, booking.end])
+
+    now = datetime.utcnow()
+    length = timedelta(minutes=duration)
+    windows, slots = [], []
+    position = 0
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        cursor = datetime.combine(day, WORKDAY_START)
+        day_end = datetime.combine(day, WORKDAY_END)
+        while position < len(merged) and merged[position][1] <= cursor:
+            position += 1
+        index = position
+        while cursor < day_end:
+            if index < len(merged) and merged[index][0] < day_end:
+                gap_end = max(cursor, merged[index][0])
+                next_cursor = merged[index][1]
+                index += 1
+            else:
+                gap_end = day_end
+                next_cursor = day_end
+            window_start = max(cursor, now)
+            if gap_end - window_start >= length:
+                windows.append((window_start, gap_end))
+                slot = _align(window_start, cursor, step)
+                while slot + length <= gap_end:
+                    slots.append(slot)
+                    if limit and len(slots) >= limit:
+                        return windows, slots
+                    slot += timedelta(minutes=step)
+            cursor = max(cursor, next_cursor)
+    return windows, slots
+
+
+def _align(moment, origin, step):
+    """Round `moment` up to the next `step`-minute mark counted from `origin`."""
+    minutes = -(-(moment - origin).total_seconds() // 60)
+    return origin + timedelta(minutes=-(-minutes // step) * step)
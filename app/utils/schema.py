@@ -0,0 +1,74 @@
+from sqlalchemy import inspect, text
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import User
+from app.utils.search import rebuild_search_index, search_index_ready
+
+DEFAULT_ADMIN_EMAIL = 'admin@talentbridge.com'
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+
+
+def missing_indexes(connection):
+    """Return model-declared indexes that do not exist in the database yet."""
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in existing)
+    return missing
+
+
+def duplicate_applications(connection):
+    """Return (job_id, user_id, count) rows that violate the one-application-per-job rule."""
+    return connection.execute(text(
+        'SELECT job_id, user_id, COUNT(*) FROM application '
+        'GROUP BY job_id, user_id HAVING COUNT(*) > 1'
+    )).all()
+
+
+def upgrade_schema(connection):
+    """Bring an existing database up to the current model definitions.
+
+    Creates missing tables and indexes; existing tables are never
+    rewritten. Returns the names of the indexes that were created.
+    """
+    db.metadata.create_all(connection)
+    created = []
+    for index in missing_indexes(connection):
+        index.create(connection)
+        created.append(index.name)
+    return created
+
+
+def ensure_admin(email=DEFAULT_ADMIN_EMAIL, password=DEFAULT_ADMIN_PASSWORD):
+    """Create the initial HR account unless a user with `email` exists. Returns True if created."""
+    if User.query.filter_by(email=email).first():
+        return False
+    db.session.add(User(
+        username=email.split('@')[0],
+        email=email,
+        password=generate_password_hash(password),
+        role='hr',
+        first_name='Admin',
+        last_name='User',
+        department='HR'
+    ))
+    db.session.commit()
+    return True
+
+
+def init_database(admin_email=DEFAULT_ADMIN_EMAIL, admin_password=DEFAULT_ADMIN_PASSWORD):
+    """Create tables, indexes, the search index and the first admin account as needed.
+
+    Safe to run repeatedly. Returns (names of created indexes, whether
+    the admin account was created).
+    """
+    with db.engine.begin() as connection:
+        created = upgrade_schema(connection)
+        # Backfill the job search index the first time it is created
+        if not search_index_ready(connection):
+            rebuild_search_index(connection)
+    return created, ensure_admin(admin_email, admin_password)
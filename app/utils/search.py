@@ -0,0 +1,156 @@
+import re
+from sqlalchemy import event, inspect, text, func, literal_column, table, column
+from app import db
+from app.models import Job
+
+# FTS5 table mirroring the searchable Job columns (SQLite only)
+FTS_TABLE = 'job_fts'
+FTS_COLUMNS = ('title', 'description', 'skills_required')
+
+job_fts = table(FTS_TABLE, column('rowid'), *[column(name) for name in FTS_COLUMNS])
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Per-engine cache of whether the full-text index is usable
+_index_ready = {}
+
+
+def _tokens(search):
+    return _TOKEN_RE.findall(search.lower())
+
+
+def _fts_query(search):
+    """Build an FTS5 MATCH expression with prefix matching on every term."""
+    return ' '.join(f'"{token}"*' for token in _tokens(search))
+
+
+def _ts_query(search):
+    """Build a Postgres to_tsquery expression with prefix matching on every term."""
+    return ' & '.join(f'{token}:*' for token in _tokens(search))
+
+
+def _pg_document():
+    return func.to_tsvector(
+        'english',
+        func.coalesce(Job.title, '') + ' ' +
+        func.coalesce(Job.description, '') + ' ' +
+        func.coalesce(Job.skills_required, '')
+    )
+
+
+def search_index_ready(connection):
+    """Return True if the full-text index exists for this connection's database."""
+    key = str(connection.engine.url)
+    if key not in _index_ready:
+        dialect = connection.dialect.name
+        if dialect == 'sqlite':
+            row = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first()
+            _index_ready[key] = row is not None
+        elif dialect == 'postgresql':
+            row = connection.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = 'ix_job_search'")
+            ).first()
+            _index_ready[key] = row is not None
+        else:
+            _index_ready[key] = False
+    return _index_ready[key]
+
+
+def create_search_index(connection):
+    """Create the full-text index for the current database if it is missing."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    elif dialect == 'postgresql':
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_job_search ON job USING GIN ("
+            "to_tsvector('english', coalesce(title, '') || ' ' || "
+            "coalesce(description, '') || ' ' || coalesce(skills_required, '')))"
+        ))
+    else:
+        return False
+    _index_ready.pop(str(connection.engine.url), None)
+    return True
+
+
+def rebuild_search_index(connection):
+    """Repopulate the full-text index from the job table.
+
+    Returns the number of indexed jobs, or None if the database has no
+    full-text support.
+    """
+    if not create_search_index(connection):
+        return None
+    if connection.dialect.name == 'sqlite':
+        # Postgres uses an expression index that never goes stale
+        connection.execute(text(f'DELETE FROM {FTS_TABLE}'))
+        connection.execute(text(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"SELECT id, {', '.join(FTS_COLUMNS)} FROM job"
+        ))
+    return connection.execute(text('SELECT COUNT(*) FROM job')).scalar()
+
+
+def apply_search(query, search):
+    """Filter and rank a Job query by a free-text search string.
+
+    Uses the full-text index when available (best matches first) and
+    falls back to ILIKE scans otherwise.
+    """
+    connection = db.session.connection()
+    if _tokens(search) and search_index_ready(connection):
+        dialect = connection.dialect.name
+        if dialect == 'sqlite':
+            query = query.join(job_fts, job_fts.c.rowid == Job.id)\
+                         .filter(literal_column(FTS_TABLE).op('MATCH')(_fts_query(search)))\
+                         .order_by(func.bm25(literal_column(FTS_TABLE)))
+            return query
+        if dialect == 'postgresql':
+            ts_query = func.to_tsquery('english', _ts_query(search))
+            query = query.filter(_pg_document().op('@@')(ts_query))\
+                         .order_by(func.ts_rank(_pg_document(), ts_query).desc())
+            return query
+
+    query = query.filter(
+        db.or_(
+            Job.title.ilike(f'%{search}%'),
+            Job.description.ilike(f'%{search}%'),
+            Job.skills_required.ilike(f'%{search}%')
+        )
+    )
+    return query
+
+
+def _sync_job(connection, job, delete_only=False):
+    if connection.dialect.name != 'sqlite' or not search_index_ready(connection):
+        return
+    connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': job.id})
+    if not delete_only:
+        connection.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+                 f"VALUES (:id, {', '.join(':' + name for name in FTS_COLUMNS)})"),
+            {'id': job.id, **{name: getattr(job, name) for name in FTS_COLUMNS}}
+        )
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, job):
+    _sync_job(connection, job)
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, job):
+    state = inspect(job)
+    if any(state.attrs[name].history.has_changes() for name in FTS_COLUMNS):
+        _sync_job(connection, job)
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, job):
+    _sync_job(connection, job, delete_only=True)
@@ -0,0 +1,317 @@
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from flask import current_app, has_app_context
+from sqlalchemy import and_, event, inspect
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import Application, Job, Skill, SkillVector, User
+from app.utils.cache import TTLCache
+from app.utils.resume_text import extract_text
+
+# Common spellings folded onto one vocabulary entry
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'golang': 'go',
+    'ml': 'machine learning',
+    'ms excel': 'excel',
+}
+
+MAX_PHRASE_WORDS = 3
+
+_SPLIT_RE = re.compile(r'[,;\n|/]+')
+_WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+_vocabulary = TTLCache(ttl=300, maxsize=1)
+
+
+def normalize_skill(raw):
+    name = re.sub(r'\s+', ' ', raw.strip().lower()).strip(' .-')
+    return SKILL_ALIASES.get(name, name)
+
+
+def split_skills(text):
+    """Split a free-text skills field into normalized skill names."""
+    if not text:
+        return []
+    names = (normalize_skill(part) for part in _SPLIT_RE.split(text))
+    return list(dict.fromkeys(name for name in names if name and len(name) <= 100))
+
+
+def _words(text):
+    return [word.rstrip('.') for word in _WORD_RE.findall(text.lower())]
+
+
+def vocabulary():
+    """Return {skill name: id} for every known skill."""
+    return _vocabulary.get_or_set('skills', lambda: dict(db.session.query(Skill.name, Skill.id).all()))
+
+
+def skill_ids(names, create=False):
+    """Map skill names to ids, optionally adding unknown names to the vocabulary."""
+    known = vocabulary()
+    missing = [name for name in names if name not in known]
+    if missing and create:
+        db.session.add_all([Skill(name=name) for name in missing])
+        db.session.flush()
+        known = dict(db.session.query(Skill.name, Skill.id).all())
+        _vocabulary.set('skills', known)
+    return {name: known[name] for name in names if name in known}
+
+
+def find_skills_in_text(text):
+    """Count occurrences of known skills (phrases of up to three words) in free text."""
+    known = vocabulary()
+    words = _words(text)
+    counts = Counter()
+    for size in range(1, MAX_PHRASE_WORDS + 1):
+        for start in range(len(words) - size + 1):
+            phrase = ' '.join(words[start:start + size])
+            phrase = SKILL_ALIASES.get(phrase, phrase)
+            if phrase in known:
+                counts[known[phrase]] += 1
+    return counts
+
+
+def pack(weights_by_id):
+    """Pack {skill id: weight} into sorted int32 ids and float32 weights."""
+    import numpy as np
+    ordered = sorted(weights_by_id)
+    ids = np.array(ordered, dtype=np.int32)
+    weights = np.array([weights_by_id[skill_id] for skill_id in ordered], dtype=np.float32)
+    return ids.tobytes(), weights.tobytes()
+
+
+def unpack(skill_ids_blob, weights_blob):
+    import numpy as np
+    return np.frombuffer(skill_ids_blob, dtype=np.int32), np.frombuffer(weights_blob, dtype=np.float32)
+
+
+def _store(kind, owner_id, weights_by_id, source_hash):
+    packed_ids, packed_weights = pack(weights_by_id)
+    vector = SkillVector.query.filter_by(kind=kind, owner_id=owner_id).first()
+    if vector is None:
+        vector = SkillVector(kind=kind, owner_id=owner_id)
+        db.session.add(vector)
+    vector.skill_ids = packed_ids
+    vector.weights = packed_weights
+    vector.source_hash = source_hash
+    return vector
+
+
+def _hash(*parts):
+    return hashlib.sha256('\x1f'.join(part or '' for part in parts).encode()).hexdigest()
+
+
+def refresh_job_vector(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        SkillVector.query.filter_by(kind='job', owner_id=job_id).delete()
+        return None
+    source_hash = _hash(job.skills_required)
+    ids = skill_ids(split_skills(job.skills_required), create=True)
+    return _store('job', job.id, {skill_id: 1.0 for skill_id in ids.values()}, source_hash)
+
+
+def _resume_filenames(user):
+    filenames = [user.resume_filename] if user.resume_filename else []
+    filenames += [filename for (filename,) in db.session.query(Application.resume_filename)
+                  .filter(Application.user_id == user.id, Application.resume_filename.isnot(None))
+                  .distinct()]
+    return sorted(set(filenames))
+
+
+def refresh_candidate_vector(user_id, force=False):
+    """Rebuild a candidate's vector from profile skills and resume text.
+
+    Declared profile skills weigh 1.0; skills only found in resumes weigh
+    0.5 plus 0.1 per extra mention, capped at 1.0.
+    """
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    filenames = _resume_filenames(user)
+    source_hash = _hash(user.skills, *filenames)
+    existing = SkillVector.query.filter_by(kind='user', owner_id=user.id).first()
+    if existing is not None and existing.source_hash == source_hash and not force:
+        return existing
+
+    weights = {}
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    for filename in filenames:
+        path = os.path.join(upload_folder, filename)
+        if not os.path.exists(path):
+            continue
+        for skill_id, mentions in find_skills_in_text(extract_text(path)).items():
+            weights[skill_id] = max(weights.get(skill_id, 0.0), min(1.0, 0.4 + 0.1 * mentions))
+    for skill_id in skill_ids(split_skills(user.skills), create=True).values():
+        weights[skill_id] = 1.0
+    return _store('user', user.id, weights, source_hash)
+
+
+def rebuild_all_vectors(force=False):
+    """Recompute every job vector, then every candidate vector. Returns (jobs, candidates)."""
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id)]
+    for job_id in job_ids:
+        refresh_job_vector(job_id)
+    db.session.commit()
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.role == 'employee')]
+    for user_id in user_ids:
+        refresh_candidate_vector(user_id, force=force)
+        db.session.commit()
+    return len(job_ids), len(user_ids)
+
+
+def _job_weights(job):
+    import numpy as np
+    vector = SkillVector.query.filter_by(kind='job', owner_id=job.id).first()
+    if vector is not None:
+        return unpack(vector.skill_ids, vector.weights)
+    # Not processed yet: look the skills up without writing to the vocabulary
+    ids = np.array(sorted(skill_ids(split_skills(job.skills_required)).values()), dtype=np.int32)
+    return ids, np.ones(len(ids), dtype=np.float32)
+
+
+def rank_applications(job, application_query):
+    """Score every application in `application_query` against the job's skills.
+
+    Returns [(application_id, score, matched_skills)] best first, where
+    score is the weighted fraction of the job's skills the candidate has.
+    All applicants are scored at once with NumPy rather than per row.
+    """
+    # Imported on first use so worker start-up does not pay for NumPy
+    import numpy as np
+    job_ids, job_weights = _job_weights(job)
+    rows = application_query.with_entities(Application.id, SkillVector.skill_ids, SkillVector.weights)\
+                            .outerjoin(SkillVector, and_(SkillVector.kind == 'user',
+                                                         SkillVector.owner_id == Application.user_id))\
+                            .order_by(None)\
+                            .all()
+    if not rows:
+        return []
+
+    application_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    vectors = [unpack(row[1], row[2]) if row[1] is not None else (np.empty(0, np.int32), np.empty(0, np.float32))
+               for row in rows]
+    lengths = np.array([len(ids) for ids, _ in vectors])
+    candidate_ids = np.concatenate([ids for ids, _ in vectors])
+    candidate_weights = np.concatenate([weights for _, weights in vectors])
+    owners = np.repeat(np.arange(len(rows)), lengths)
+
+    scores = np.zeros(len(rows))
+    matched = np.zeros(len(rows), dtype=np.int64)
+    if len(job_ids) and len(candidate_ids):
+        positions = np.clip(np.searchsorted(job_ids, candidate_ids), 0, len(job_ids) - 1)
+        hits = job_ids[positions] == candidate_ids
+        contributions = candidate_weights[hits] * job_weights[positions[hits]]
+        scores = np.bincount(owners[hits], weights=contributions, minlength=len(rows)) / job_weights.sum()
+        matched = np.bincount(owners[hits], minlength=len(rows))
+
+    order = np.lexsort((application_ids, -scores))
+    return [(int(application_ids[i]), float(scores[i]), int(matched[i])) for i in order]
+
+
+# Background pipeline: mapper events collect the affected jobs/candidates on
+# the session and a worker thread refreshes their vectors after commit.
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _run(app, jobs, users):
+    with app.app_context():
+        try:
+            for job_id in jobs:
+                refresh_job_vector(job_id)
+            db.session.commit()
+            for user_id in users:
+                refresh_candidate_vector(user_id)
+                db.session.commit()
+        except Exception:
+            app.logger.exception('Failed to refresh skill vectors')
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def schedule_refresh(jobs=(), users=()):
+    global _executor, _executor_pid
+    app = current_app._get_current_object()
+    if app.config.get('SKILLS_PIPELINE', 'thread') != 'thread':
+        return
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='skills')
+            _executor_pid = os.getpid()
+    _executor.submit(_run, app, sorted(jobs), sorted(users))
+
+
+def _mark(target, kind, owner_id):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('skills_dirty', {'jobs': set(), 'users': set()})[kind].add(owner_id)
+
+
+def _changed(target, *names):
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    if target.skills_required:
+        _mark(target, 'jobs', target.id)
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    if _changed(target, 'skills_required'):
+        _mark(target, 'jobs', target.id)
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    connection.execute(
+        SkillVector.__table__.delete().where(and_(SkillVector.kind == 'job', SkillVector.owner_id == target.id))
+    )
+
+
+@event.listens_for(User, 'after_insert')
+def _user_inserted(mapper, connection, target):
+    if target.skills or target.resume_filename:
+        _mark(target, 'users', target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    if _changed(target, 'skills', 'resume_filename'):
+        _mark(target, 'users', target.id)
+
+
+@event.listens_for(Application, 'after_insert')
+def _application_inserted(mapper, connection, target):
+    if target.resume_filename:
+        _mark(target, 'users', target.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _refresh_dirty(session):
+    dirty = session.info.pop('skills_dirty', None)
+    if dirty and has_app_context() and (dirty['jobs'] or dirty['users']):
+        schedule_refresh(jobs=dirty['jobs'], users=dirty['users'])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty(session):
+    session.info.pop('skills_dirty', None)
@@ -0,0 +1,181 @@
+import threading
+from collections import Counter
+from sqlalchemy import event, func, inspect, literal, select, union_all
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.util import identity_key
+from app import db
+from app.models import Job, Application
+from app.utils.cache import TTLCache
+from app.utils.deltas import PendingDeltas, attribute_change, track_changes
+
+STATS_TTL = 30
+
+_cache = TTLCache(ttl=STATS_TTL, maxsize=1)
+_lock = threading.Lock()
+
+_UNKNOWN = object()
+
+
+class DashboardStats:
+    """Job and application counts keyed by (status, department)."""
+
+    def __init__(self, jobs, applications):
+        self.jobs = jobs
+        self.applications = applications
+
+    @property
+    def total_jobs(self):
+        return sum(self.jobs.values())
+
+    @property
+    def active_jobs(self):
+        return sum(n for (status, _), n in self.jobs.items() if status == 'active')
+
+    @property
+    def total_applications(self):
+        return sum(self.applications.values())
+
+    @property
+    def pending_applications(self):
+        return sum(n for (status, _), n in self.applications.items() if status == 'submitted')
+
+    @property
+    def applications_by_status(self):
+        counts = Counter()
+        for (status, _), n in self.applications.items():
+            counts[status] += n
+        return sorted((status, n) for status, n in counts.items() if n > 0)
+
+    @property
+    def by_department(self):
+        departments = {}
+        for (status, department), n in self.jobs.items():
+            row = departments.setdefault(department, {'jobs': 0, 'active_jobs': 0, 'applications': 0})
+            row['jobs'] += n
+            if status == 'active':
+                row['active_jobs'] += n
+        for (status, department), n in self.applications.items():
+            row = departments.setdefault(department, {'jobs': 0, 'active_jobs': 0, 'applications': 0})
+            row['applications'] += n
+        return sorted(
+            ((department, row) for department, row in departments.items() if any(row.values())),
+            key=lambda item: item[0] or ''
+        )
+
+    def apply(self, deltas):
+        """Return a copy with the deltas applied; cached stats are shared between threads and never mutated."""
+        stats = DashboardStats(self.jobs.copy(), self.applications.copy())
+        for kind, key, n in deltas:
+            getattr(stats, kind)[key] += n
+        return stats
+
+
+def compute_stats():
+    """Load every dashboard counter with a single grouped query."""
+    job_counts = select(
+        literal('jobs').label('kind'), Job.status, Job.department, func.count().label('n')
+    ).group_by(Job.status, Job.department)
+    application_counts = select(
+        literal('applications').label('kind'), Application.status, Job.department, func.count().label('n')
+    ).join(Job, Application.job_id == Job.id).group_by(Application.status, Job.department)
+
+    stats = DashboardStats(Counter(), Counter())
+    for kind, status, department, n in db.session.execute(union_all(job_counts, application_counts)):
+        getattr(stats, kind)[(status, department)] += n
+    return stats
+
+
+def get_dashboard_stats():
+    return _cache.get_or_set('dashboard', compute_stats)
+
+
+def invalidate_stats():
+    _cache.clear()
+
+
+# Write tracking: mapper events record deltas on the session, which are
+# applied to the cached counters only once the transaction commits.
+
+def _apply_deltas(deltas):
+    with _lock:
+        stats = _cache.get('dashboard')
+        if stats is None:
+            return
+        if None in deltas:
+            invalidate_stats()
+        else:
+            _cache.replace('dashboard', stats.apply(deltas))
+
+
+_pending = PendingDeltas('stats_deltas', _apply_deltas)
+track_changes(Job.status, Job.department, Application.status, Application.job_id)
+
+
+def _job_department(target):
+    job = inspect(target).attrs.job.loaded_value
+    if isinstance(job, Job):
+        return job.department
+    session = object_session(target)
+    if session is not None:
+        job = session.identity_map.get(identity_key(Job, target.job_id))
+        if job is not None:
+            return job.department
+    return _UNKNOWN
+
+
+@event.listens_for(Job, 'after_insert')
+def _job_inserted(mapper, connection, target):
+    _pending.record(target, ('jobs', (target.status, target.department), 1))
+
+
+@event.listens_for(Job, 'after_update')
+def _job_updated(mapper, connection, target):
+    old_status, new_status = attribute_change(target, 'status')
+    old_department, new_department = attribute_change(target, 'department')
+    if (old_status, old_department) != (new_status, new_department):
+        _pending.record(target,
+                ('jobs', (old_status, old_department), -1),
+                ('jobs', (new_status, new_department), 1))
+        if old_department != new_department:
+            # The job's applications move department too; recount
+            _pending.record(target, None)
+
+
+@event.listens_for(Job, 'after_delete')
+def _job_deleted(mapper, connection, target):
+    # Deleting a job cascades to its applications
+    _pending.record(target, ('jobs', (target.status, target.department), -1), None)
+
+
+@event.listens_for(Application, 'after_insert')
+def _application_inserted(mapper, connection, target):
+    department = _job_department(target)
+    if department is _UNKNOWN:
+        _pending.record(target, None)
+    else:
+        _pending.record(target, ('applications', (target.status, department), 1))
+
+
+@event.listens_for(Application, 'after_update')
+def _application_updated(mapper, connection, target):
+    old_status, new_status = attribute_change(target, 'status')
+    old_job, new_job = attribute_change(target, 'job_id')
+    if old_job != new_job:
+        _pending.record(target, None)
+    elif old_status != new_status:
+        department = _job_department(target)
+        if department is _UNKNOWN:
+            _pending.record(target, None)
+        else:
+            _pending.record(target,
+                    ('applications', (old_status, department), -1),
+                    ('applications', (new_status, department), 1))
+
+
+@event.listens_for(Application, 'after_delete')
+def _application_deleted(mapper, connection, target):
+    department = _job_department(target)
+    if department is _UNKNOWN:
+        _pending.record(target, None)
+    else:
+        _pending.record(target, ('applications', (target.status, department), -1))
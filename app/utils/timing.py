@@ -0,0 +1,145 @@
+import logging
+import time
+from contextlib import contextmanager
+from flask import before_render_template, g, has_app_context, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+request_log = logging.getLogger('app.timing')
+slow_query_log = logging.getLogger('app.sql')
+
+# Longest statement text written to the slow-query log
+MAX_STATEMENT_LENGTH = 2000
+
+
+class RequestTimings:
+    """Time spent per category (db, template, email) during one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.totals = {}
+        self.counts = {}
+        self.template_depth = 0
+        self.template_started = None
+
+    def add(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def ms(self, name):
+        return self.totals.get(name, 0.0) * 1000
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def current_timings():
+    if has_app_context():
+        return g.get('_timings')
+    return None
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's `name` total."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_timings()
+        if timings is not None:
+            timings.add(name, time.perf_counter() - started)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get('_query_started')
+    if not stack:
+        return
+    duration = time.perf_counter() - stack.pop()
+    timings = current_timings()
+    if timings is not None:
+        timings.add('db', duration)
+    _log_slow_query(statement, duration)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _query_failed(context):
+    stack = context.connection.info.get('_query_started') if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+
+def _log_slow_query(statement, duration):
+    if not has_app_context():
+        return
+    from flask import current_app
+    threshold = current_app.config.get('SLOW_QUERY_MS')
+    if not threshold or duration * 1000 < threshold:
+        return
+    endpoint = (request.endpoint or request.path) if has_request_context() else 'background'
+    slow_query_log.warning('slow query duration_ms=%.1f endpoint=%s\n%s',
+                           duration * 1000, endpoint, statement[:MAX_STATEMENT_LENGTH])
+
+
+def _template_started(sender, template, context, **extra):
+    timings = current_timings()
+    if timings is None:
+        return
+    # Only the outermost render counts, so templates rendered inside a view's template are not added twice
+    if timings.template_depth == 0:
+        timings.template_started = time.perf_counter()
+    timings.template_depth += 1
+
+
+def _template_finished(sender, template, context, **extra):
+    timings = current_timings()
+    if timings is None or not timings.template_depth:
+        return
+    timings.template_depth -= 1
+    if timings.template_depth == 0:
+        timings.add('template', time.perf_counter() - timings.template_started)
+
+
+def server_timing_header(timings, total_ms):
+    parts = [f'db;dur={timings.ms("db"):.1f};desc="{timings.counts.get("db", 0)} queries"',
+             f'template;dur={timings.ms("template"):.1f}']
+    if 'email' in timings.totals:
+        parts.append(f'email;dur={timings.ms("email"):.1f}')
+    parts.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
+
+
+def init_timing(app):
+    """Time SQL, template rendering and email queueing for every request.
+
+    Adds a Server-Timing header (when SERVER_TIMING is on) and logs one
+    line per request to the app.timing logger. Statements slower than
+    SLOW_QUERY_MS go to the app.sql logger with the endpoint that ran them.
+    """
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+    @app.before_request
+    def start_timing():
+        g._timings = RequestTimings()
+
+    @app.after_request
+    def finish_timing(response):
+        timings = g.pop('_timings', None)
+        if timings is None:
+            return response
+        total_ms = timings.elapsed_ms()
+        if app.config.get('SERVER_TIMING'):
+            response.headers['Server-Timing'] = server_timing_header(timings, total_ms)
+        request_log.info(
+            'request endpoint=%s method=%s status=%s total_ms=%.1f db_ms=%.1f db_queries=%d '
+            'template_ms=%.1f email_ms=%.1f',
+            request.endpoint, request.method, response.status_code, total_ms, timings.ms('db'),
+            timings.counts.get('db', 0), timings.ms('template'), timings.ms('email'))
+        return response
@@ -0,0 +1,125 @@
+import bisect
+import heapq
+import re
+import threading
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import Job
+from app.utils.cache import TTLCache
+from app.utils.skills import split_skills
+
+MIN_PREFIX = 2
+
+_WORD_START_RE = re.compile(r'(?:^|(?<=[\s/(,-]))\w')
+
+_index = TTLCache(ttl=600, maxsize=1)
+_build_lock = threading.Lock()
+
+
+class PrefixIndex:
+    """Sorted (key, value) pairs searched by prefix with bisect.
+
+    Job titles are indexed from every word start, so "dev" finds
+    "Senior Python Developer"; skills are indexed by name.
+    """
+
+    def __init__(self, job_titles, skill_counts):
+        # Whole titles and later word starts are kept apart so title-start
+        # matches come first without sorting the matching range per query
+        title_starts, word_starts = [], []
+        for job_id, title in job_titles:
+            lowered = title.lower()
+            for match in _WORD_START_RE.finditer(lowered):
+                entries = word_starts if match.start() else title_starts
+                entries.append((lowered[match.start():], job_id, title))
+        title_starts.sort()
+        word_starts.sort()
+        self._title_starts = title_starts
+        self._title_start_keys = [entry[0] for entry in title_starts]
+        self._word_starts = word_starts
+        self._word_start_keys = [entry[0] for entry in word_starts]
+
+        skills = sorted(skill_counts.items())
+        self._skill_keys = [name for name, _ in skills]
+        self._skills = skills
+
+    @staticmethod
+    def _range(keys, prefix):
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', lo=start)
+        return start, end
+
+    def jobs(self, prefix, limit):
+        results = []
+        seen = set()
+        for keys, entries in ((self._title_start_keys, self._title_starts),
+                              (self._word_start_keys, self._word_starts)):
+            start, end = self._range(keys, prefix)
+            for position in range(start, end):
+                _, job_id, title = entries[position]
+                if job_id not in seen:
+                    seen.add(job_id)
+                    results.append({'id': job_id, 'title': title})
+                    if len(results) == limit:
+                        return results
+        return results
+
+    def skills(self, prefix, limit):
+        start, end = self._range(self._skill_keys, prefix)
+        matches = heapq.nsmallest(limit, (self._skills[position] for position in range(start, end)),
+                                  key=lambda item: (-item[1], item[0]))
+        return [{'name': name, 'jobs': count} for name, count in matches]
+
+
+def build_index():
+    titles = []
+    skill_counts = Counter()
+    rows = db.session.query(Job.id, Job.title, Job.skills_required).filter(Job.status == 'active')
+    for job_id, title, skills_required in rows:
+        titles.append((job_id, title))
+        skill_counts.update(split_skills(skills_required))
+    return PrefixIndex(titles, skill_counts)
+
+
+def get_index():
+    index = _index.get('jobs')
+    if index is None:
+        # One build at a time; concurrent requests wait for it instead of repeating it
+        with _build_lock:
+            index = _index.get_or_set('jobs', build_index)
+    return index
+
+
+def suggest(query, limit=8):
+    """Return {'jobs': [...], 'skills': [...]} whose titles/names start with the query words."""
+    prefix = ' '.join(query.lower().split())
+    if len(prefix) < MIN_PREFIX:
+        return {'jobs': [], 'skills': []}
+    index = get_index()
+    return {'jobs': index.jobs(prefix, limit), 'skills': index.skills(prefix, limit)}
+
+
+def invalidate_index():
+    _index.clear()
+
+
+@event.listens_for(Job, 'after_insert')
+@event.listens_for(Job, 'after_update')
+@event.listens_for(Job, 'after_delete')
+def _job_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info['typeahead_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _rebuild_later(session):
+    if session.info.pop('typeahead_dirty', False):
+        invalidate_index()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard(session):
+    session.info.pop('typeahead_dirty', None)
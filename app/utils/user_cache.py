@@ -0,0 +1,117 @@
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app import db
+from app.models import User
+from app.utils.cache import TTLCache
+
+# Columns needed on every request (navbar, role checks, ownership checks)
+PRINCIPAL_COLUMNS = (User.id, User.role, User.username, User.email, User.first_name, User.last_name)
+
+# Per process: other workers keep a changed role until USER_CACHE_TTL runs out
+_principals = TTLCache(ttl=60, maxsize=10000)
+
+
+class SessionUser:
+    """Lightweight stand-in for the logged-in User, built from cached columns.
+
+    Role and ownership checks never touch the database. Reading any other
+    attribute (skills, resume_filename, ...) loads the full User once per
+    request; routes that modify the account should work on `.user`.
+    """
+
+    __slots__ = ('id', 'role', 'username', 'email', 'first_name', 'last_name', '_user')
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, id, role, username, email, first_name, last_name):
+        self.id = id
+        self.role = role
+        self.username = username
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self._user = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not slots, i.e. the uncached columns
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def get_id(self):
+        return str(self.id)
+
+    def get_full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+    def __eq__(self, other):
+        if isinstance(other, (SessionUser, User)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f'<SessionUser {self.username}>'
+
+
+def _fetch(user_id):
+    return db.session.query(*PRINCIPAL_COLUMNS).filter(User.id == user_id).first()
+
+
+def load_session_user(user_id):
+    """Return a SessionUser for the id stored in the session, or None if the user is gone."""
+    ttl = current_app.config.get('USER_CACHE_TTL', 60)
+    if ttl <= 0:
+        row = _fetch(user_id)
+    else:
+        row = _principals.get(user_id)
+        if row is None:
+            row = _fetch(user_id)
+            if row is not None:
+                _principals.set(user_id, tuple(row), ttl)
+    return SessionUser(*row) if row is not None else None
+
+
+def invalidate_user(user_id):
+    _principals.delete(user_id)
+
+
+# Profile edits, password and role changes all go through the User mapper;
+# cached principals are dropped once the change is committed.
+
+def _mark(target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('users_changed', set()).add(target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    _mark(target)
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    _mark(target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _drop_changed(session):
+    for user_id in session.info.pop('users_changed', ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _keep_cached(session):
+    session.info.pop('users_changed', None)
@@ -3,4 +3,8 @@ import os
 app = create_app()
 if __name__ == '__main__':
     os.makedirs('app/static/uploads/resumes', exist_ok=True)
+    # Production runs `flask init-db` on release; the dev server sets up its own database
+    from app.utils.schema import init_database
+    with app.app_context():
+        init_database()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Config reads the environment when app.config is first imported, so this runs before any app import
+INSTANCE_DIR = tempfile.mkdtemp(prefix='talentbridge-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(INSTANCE_DIR, 'test.db')
+os.environ['UPLOAD_FOLDER'] = os.path.join(INSTANCE_DIR, 'uploads')
+os.environ['SKILLS_PIPELINE'] = 'none'
+os.environ['EMAIL_QUEUE_WORKER'] = 'none'
+os.environ['MAIL_DEFAULT_SENDER'] = 'noreply@talentbridge.test'
+
+from app import create_app, db  # noqa: E402
+from app.utils.benchmark import APPLICANT_EMAIL, BENCH_PASSWORD, HR_EMAIL, seed_dataset  # noqa: E402
+from app.utils.schema import init_database  # noqa: E402
+
+CANDIDATE_EMAIL = 'bench-candidate-0@example.com'
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        init_database()
+        seed_dataset(users=40, jobs=20, applications=200, interviews=40)
+        db.session.remove()
+    yield app
+    shutil.rmtree(INSTANCE_DIR, ignore_errors=True)
+
+
+def login(app, email, password=BENCH_PASSWORD):
+    client = app.test_client()
+    response = client.post('/auth/login', data={'email': email, 'password': password})
+    assert response.status_code == 302, response.data
+    return client
+
+
+@pytest.fixture
+def hr_client(app):
+    return login(app, HR_EMAIL)
+
+
+@pytest.fixture
+def candidate_client(app):
+    return login(app, CANDIDATE_EMAIL)
+
+
+@pytest.fixture
+def applicant_client(app):
+    # Has no applications of their own
+    return login(app, APPLICANT_EMAIL)
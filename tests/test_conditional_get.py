@@ -0,0 +1,39 @@
+"""Conditional GETs on job pages: a 304 must not hide a changed navbar badge."""
+import pytest
+
+from app import db
+from app.models import Job, Notification, User
+from app.utils.benchmark import APPLICANT_EMAIL
+from app.utils.notifications import notify
+
+
+@pytest.fixture
+def applicant_id(app):
+    with app.app_context():
+        user_id = User.query.filter_by(email=APPLICANT_EMAIL).one().id
+        yield user_id
+        Notification.query.filter_by(user_id=user_id).delete()
+        db.session.commit()
+        db.session.remove()
+
+
+@pytest.fixture
+def job_id(app):
+    with app.app_context():
+        return Job.query.filter_by(status='active').first().id
+
+
+@pytest.mark.parametrize('url', ['/jobs/list', '/jobs/{job_id}'])
+def test_new_notification_changes_the_etag(app, applicant_client, applicant_id, job_id, url):
+    url = url.format(job_id=job_id)
+    first = applicant_client.get(url)
+    etag = first.headers['ETag']
+    assert applicant_client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    notify([(applicant_id, 'Heads up', 'Something happened')])
+    db.session.commit()
+
+    response = applicant_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert b'id="notification-badge" class="badge rounded-pill bg-danger"' in response.data
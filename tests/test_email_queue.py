@@ -0,0 +1,184 @@
+"""The outbox against a fake SMTP server: enqueue, delivery, retries and the worker."""
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Job, OutboundEmail, OutboundEmailAttachment
+from app.utils import email_queue
+from app.utils.email_queue import drain_outbox, enqueue_email, enqueue_emails
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 fake ESMTP')
+        recipients = []
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(' ', 1)[0].split(':', 1)[0].upper()
+            if verb in ('EHLO', 'HELO', 'MAIL', 'RSET', 'NOOP'):
+                recipients = [] if verb in ('MAIL', 'RSET') else recipients
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                if address in self.server.rejected:
+                    self.reply('550 mailbox unavailable')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 end with .')
+                lines = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data_line)
+                self.server.received.append((recipients, b''.join(lines)))
+                self.reply('250 queued')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('502 not implemented')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.received = []
+        self.rejected = set()
+
+
+@pytest.fixture
+def smtp(app, monkeypatch):
+    server = FakeSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state = app.extensions['mail']
+    for name, value in (('server', '127.0.0.1'), ('port', server.server_address[1]), ('use_tls', False),
+                        ('use_ssl', False), ('username', None), ('suppress', False)):
+        monkeypatch.setattr(state, name, value)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        OutboundEmailAttachment.query.delete()
+        OutboundEmail.query.delete()
+        db.session.commit()
+        yield
+        db.session.remove()
+
+
+def message(recipient, subject='Hello'):
+    return {'recipients': [recipient], 'subject': subject, 'html': '<p>Hi</p>'}
+
+
+def test_enqueue_is_part_of_the_callers_transaction(ctx):
+    job = Job(title='Outbox test', description='x', posted_by=1, status='active')
+    db.session.add(job)
+    enqueue_email(['a@example.com'], 'Rolled back', '<p>x</p>')
+    db.session.rollback()
+    assert OutboundEmail.query.count() == 0
+    assert Job.query.filter_by(title='Outbox test').count() == 0
+
+    enqueue_email(['a@example.com'], 'Committed', '<p>x</p>')
+    db.session.commit()
+    assert OutboundEmail.query.one().status == 'pending'
+
+
+def test_drain_sends_every_due_message(ctx, smtp):
+    enqueue_emails([message(f'user{i}@example.com') for i in range(4)] + [
+        dict(message('cal@example.com'), attachments=[('interview.ics', 'text/calendar', 'BEGIN:VCALENDAR')])
+    ])
+    db.session.commit()
+
+    batches = []
+    while True:
+        claimed = drain_outbox(batch_size=2)
+        if not claimed:
+            break
+        batches.append(claimed)
+
+    assert batches == [2, 2, 1]
+    assert len(smtp.received) == 5
+    assert {status for (status,) in db.session.query(OutboundEmail.status)} == {'sent'}
+    calendar = next(data for recipients, data in smtp.received if recipients == ['cal@example.com'])
+    assert b'interview.ics' in calendar
+
+
+def test_failed_message_is_retried_with_backoff(ctx, smtp, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'EMAIL_RETRY_BACKOFF', 30)
+    smtp.rejected.add('bounce@example.com')
+    enqueue_emails([message('ok@example.com'), message('bounce@example.com')])
+    db.session.commit()
+
+    assert drain_outbox() == 2
+    bounced = OutboundEmail.query.filter_by(recipients='bounce@example.com').one()
+    assert OutboundEmail.query.filter_by(recipients='ok@example.com').one().status == 'sent'
+    assert (bounced.status, bounced.attempts) == ('pending', 1)
+    assert bounced.next_attempt_at > datetime.utcnow() + timedelta(seconds=20)
+    assert bounced.last_error
+
+    # Not due yet
+    assert drain_outbox() == 0
+
+    smtp.rejected.clear()
+    bounced.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    assert drain_outbox() == 1
+    db.session.refresh(bounced)
+    assert bounced.status == 'sent'
+    assert [recipients for recipients, _ in smtp.received] == [['ok@example.com'], ['bounce@example.com']]
+
+
+def test_unreachable_server_dead_letters_after_max_attempts(ctx, app, monkeypatch):
+    with socketserver.TCPServer(('127.0.0.1', 0), socketserver.BaseRequestHandler) as closed:
+        port = closed.server_address[1]
+    state = app.extensions['mail']
+    for name, value in (('server', '127.0.0.1'), ('port', port), ('use_tls', False), ('suppress', False)):
+        monkeypatch.setattr(state, name, value)
+    monkeypatch.setitem(app.config, 'EMAIL_MAX_ATTEMPTS', 2)
+    enqueue_emails([message('a@example.com'), message('b@example.com')])
+    db.session.commit()
+
+    assert drain_outbox() == 2
+    assert {(email.status, email.attempts) for email in OutboundEmail.query} == {('pending', 1)}
+
+    OutboundEmail.query.update({'next_attempt_at': datetime.utcnow()})
+    db.session.commit()
+    assert drain_outbox() == 2
+    assert {(email.status, email.attempts) for email in OutboundEmail.query} == {('dead', 2)}
+
+
+def test_worker_drains_backlog_on_first_request(ctx, smtp, app, monkeypatch):
+    # Left pending by a previous process; nothing in this one enqueues
+    enqueue_emails([message('backlog1@example.com'), message('backlog2@example.com')])
+    db.session.commit()
+
+    monkeypatch.setitem(app.config, 'EMAIL_QUEUE_WORKER', 'thread')
+    monkeypatch.setitem(app.config, 'EMAIL_QUEUE_POLL_INTERVAL', 60)
+    try:
+        assert app.test_client().get('/auth/login').status_code == 200
+        deadline = time.monotonic() + 10
+        while len(smtp.received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        email_queue.stop_worker()
+
+    assert sorted(recipients[0] for recipients, _ in smtp.received) == ['backlog1@example.com',
+                                                                          'backlog2@example.com']
+    db.session.expire_all()
+    assert {status for (status,) in db.session.query(OutboundEmail.status)} == {'sent'}
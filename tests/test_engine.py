@@ -0,0 +1,76 @@
+"""SQLite connection tuning: pragmas on new connections and concurrent writer processes."""
+import multiprocessing
+import os
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import Config
+from app.utils.engine import configure_engine
+
+PROCESSES = 4
+TRANSACTIONS = 100
+
+
+def sqlite_config():
+    return {name: getattr(Config, name) for name in ('SQLITE_BUSY_TIMEOUT', 'SQLITE_CACHE_SIZE_KB', 'SQLITE_MMAP_SIZE')}
+
+
+def tuned_engine(path):
+    engine = create_engine(f'sqlite:///{path}')
+    configure_engine(engine, sqlite_config())
+    return engine
+
+
+def write_worker(args):
+    path, worker = args
+    engine = tuned_engine(path)
+    failures = []
+    for number in range(TRANSACTIONS):
+        try:
+            # Read then write in one transaction, as the ORM does for update_status
+            with engine.begin() as connection:
+                total = connection.execute(text('SELECT total FROM counter WHERE id = 1')).scalar_one()
+                connection.execute(text('UPDATE counter SET total = total + 1 WHERE id = 1'))
+                connection.execute(text('INSERT INTO event (worker, seen) VALUES (:worker, :seen)'),
+                                   {'worker': worker, 'seen': total})
+        except OperationalError as e:
+            failures.append(str(e.orig))
+    engine.dispose()
+    return failures
+
+
+def test_new_connections_get_the_pragmas(tmp_path):
+    engine = tuned_engine(tmp_path / 'pragmas.db')
+    with engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == Config.SQLITE_BUSY_TIMEOUT
+        assert connection.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+    engine.dispose()
+
+
+def test_app_engine_uses_wal(app):
+    from app import db
+    with app.app_context(), db.engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == app.config['SQLITE_BUSY_TIMEOUT']
+
+
+def test_concurrent_writer_processes_never_see_locked_database(tmp_path):
+    path = os.fspath(tmp_path / 'writes.db')
+    engine = tuned_engine(path)
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE counter (id INTEGER PRIMARY KEY, total INTEGER NOT NULL)'))
+        connection.execute(text('CREATE TABLE event (id INTEGER PRIMARY KEY, worker INTEGER, seen INTEGER)'))
+        connection.execute(text('INSERT INTO counter (id, total) VALUES (1, 0)'))
+
+    # Separate interpreters, like gunicorn workers
+    with multiprocessing.get_context('spawn').Pool(PROCESSES) as pool:
+        results = pool.map(write_worker, [(path, worker) for worker in range(PROCESSES)])
+    failures = [failure for worker_failures in results for failure in worker_failures]
+
+    assert failures == []
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT total FROM counter')).scalar_one() == PROCESSES * TRANSACTIONS
+        assert connection.execute(text('SELECT COUNT(*) FROM event')).scalar_one() == PROCESSES * TRANSACTIONS
+    engine.dispose()
@@ -0,0 +1,61 @@
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app import db
+from app.models import StoredFile
+from app.utils.file_helper import _add_stored_file, retain_file, save_uploaded_file
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    with app.app_context():
+        yield tmp_path
+        db.session.remove()
+
+
+def upload(data, name='resume.pdf'):
+    return FileStorage(stream=io.BytesIO(data), filename=name)
+
+
+def test_rolled_back_upload_leaves_no_file(upload_folder):
+    filename = save_uploaded_file(upload(b'%PDF rolled back'))
+    assert (upload_folder / filename).exists()
+    db.session.rollback()
+    assert not (upload_folder / filename).exists()
+    assert StoredFile.query.filter_by(filename=filename).first() is None
+
+
+def test_rolled_back_reference_keeps_shared_file(upload_folder):
+    filename = save_uploaded_file(upload(b'%PDF shared'))
+    db.session.commit()
+    assert save_uploaded_file(upload(b'%PDF shared', 'copy.pdf')) == filename
+    db.session.rollback()
+    assert (upload_folder / filename).exists()
+    assert StoredFile.query.filter_by(filename=filename).one().ref_count == 1
+
+
+def test_identical_legacy_files_share_one_row(upload_folder):
+    for name in ('legacy-a_resume.pdf', 'legacy-b_resume.pdf'):
+        (upload_folder / name).write_bytes(b'%PDF legacy')
+    first = retain_file('legacy-a_resume.pdf')
+    second = retain_file('legacy-b_resume.pdf')
+    db.session.commit()
+    assert first == second == 'legacy-a_resume.pdf'
+    # The legacy owner's reference plus the two retained ones
+    assert StoredFile.query.filter_by(filename=first).one().ref_count == 3
+    assert os.path.exists(upload_folder / 'legacy-b_resume.pdf')
+
+
+def test_concurrently_stored_content_is_reused(upload_folder):
+    sha256 = 'c' * 64
+    # Another request stored the same content between our lookup and insert
+    with db.engine.begin() as connection:
+        connection.execute(StoredFile.__table__.insert().values(sha256=sha256, filename='theirs.pdf', size=1,
+                                                                ref_count=1))
+    stored_file, created = _add_stored_file(sha256, filename='ours.pdf', size=1, ref_count=0)
+    db.session.commit()
+    assert (stored_file.filename, created) == ('theirs.pdf', False)
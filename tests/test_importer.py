@@ -0,0 +1,49 @@
+"""User imports: malformed JSON values and usernames derived from emails."""
+import pytest
+
+from app import db
+from app.models import User
+from app.utils.importer import import_users
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+        User.query.filter(User.email.ilike('import-%')).delete(synchronize_session=False)
+        db.session.commit()
+        db.session.remove()
+
+
+def person(email, **fields):
+    return dict({'email': email, 'first_name': 'Ada', 'last_name': 'Lovelace', 'password_hash': 'x'}, **fields)
+
+
+def test_non_text_values_are_skipped_not_fatal(ctx):
+    report = import_users(enumerate([
+        person(12345),
+        person('import-a@example.com', username=['ada']),
+        person('import-b@example.com', first_name=7),
+        person('import-ok@example.com'),
+    ], 1), workers=1)
+
+    assert report.inserted == 1
+    assert [line for line, _ in report.skipped] == [1, 2, 3]
+    assert report.skipped[0][1] == 'email must be text'
+    assert User.query.filter_by(email='import-ok@example.com').one().username == 'import-ok'
+
+
+def test_derived_usernames_get_a_suffix(ctx):
+    report = import_users(enumerate([
+        person('import-sam@example.com'),
+        person('import-sam@example.org'),
+        person('IMPORT-SAM@example.net'),
+        person('import-x@example.com', username='import-sam'),
+    ], 1), workers=1)
+
+    assert report.inserted == 3
+    assert report.skipped == [(4, 'username import-sam already exists')]
+    usernames = {user.email: user.username for user in User.query.filter(User.email.ilike('import-sam@%'))}
+    assert usernames == {'import-sam@example.com': 'import-sam',
+                         'import-sam@example.org': 'import-sam2',
+                         'IMPORT-SAM@example.net': 'IMPORT-SAM3'}
@@ -0,0 +1,92 @@
+"""Budgeted pages render within their @query_budget with cold caches.
+
+TESTING makes an over-budget view raise QueryBudgetExceeded, which the
+test client surfaces as an exception.
+"""
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Application, SkillVector
+from app.utils.importer import invalidate_caches
+
+
+@pytest.fixture(autouse=True)
+def cold_caches(app):
+    with app.app_context():
+        invalidate_caches()
+    yield
+
+
+@pytest.fixture
+def ranked_job_id(app):
+    with app.app_context():
+        job_id = db.session.query(Application.job_id).order_by(Application.id).limit(1).scalar()
+        # With SKILLS_PIPELINE='none' no vectors exist, so ranking falls back to Job.skills_required
+        assert not SkillVector.query.filter_by(kind='job', owner_id=job_id).count()
+        return job_id
+
+
+def test_manage_applications_ranked_by_skills(hr_client, ranked_job_id):
+    response = hr_client.get(f'/applications/manage?job_id={ranked_job_id}&rank=skills')
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('client_name, url', [
+    ('candidate_client', '/jobs/employee-dashboard'),
+    ('hr_client', '/jobs/hr-dashboard'),
+    ('candidate_client', '/jobs/list'),
+    ('candidate_client', '/jobs/list?search=python'),
+    ('candidate_client', '/jobs/list?department=Engineering&location=Remote'),
+    ('candidate_client', '/applications/my-applications'),
+    ('applicant_client', '/applications/my-applications'),
+    ('hr_client', '/applications/manage'),
+    ('hr_client', '/applications/manage?status=submitted'),
+    ('hr_client', '/interviews/list'),
+    ('hr_client', '/interviews/list?status=scheduled'),
+    ('candidate_client', '/interviews/list'),
+    ('candidate_client', '/notifications/'),
+])
+def test_budgeted_page(request, client_name, url):
+    client = request.getfixturevalue(client_name)
+    response = client.get(url)
+    assert response.status_code == 200
+
+
+def _application_ids(app, count, offset):
+    with app.app_context():
+        return [application_id for (application_id,) in db.session.query(Application.id)
+                .order_by(Application.id.desc()).offset(offset).limit(count)]
+
+
+def test_schedule_bulk_form(app, hr_client):
+    response = hr_client.get('/interviews/schedule-bulk', query_string={'application_ids': _application_ids(app, 5, 0)})
+    assert response.status_code == 200
+
+
+def test_schedule_bulk_reads_do_not_grow_per_application(app, hr_client):
+    selects = []
+
+    def count_select(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            selects.append(statement)
+
+    def schedule(application_ids, day):
+        selects.clear()
+        response = hr_client.post('/interviews/schedule-bulk', data={
+            'application_ids': application_ids, 'scheduled_date': day, 'scheduled_time': '09:00',
+            'duration': '30', 'break_minutes': '0', 'interview_type': 'video',
+            'location_or_link': 'https://meet.example.com/x', 'interviewer_email': f'bulk-{day}@example.com',
+        })
+        assert response.status_code == 302
+        return len(selects)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count_select)
+    try:
+        few = schedule(_application_ids(app, 2, 10), '2031-03-03')
+        many = schedule(_application_ids(app, 8, 20), '2031-03-04')
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_select)
+    assert many == few
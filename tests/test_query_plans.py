@@ -0,0 +1,73 @@
+"""The hot route queries must be index searches, not table scans.
+
+Each statement mirrors the query a route runs (filters, ordering, limit)
+and is planned with EXPLAIN QUERY PLAN against the schema declared in
+app.models, so dropping or reshaping an index fails here.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, select, tuple_
+
+from app import db
+from app.models import Application, Interview, Job
+
+NOW = datetime(2024, 1, 1)
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement):
+    compiled = statement.compile(dialect=engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with engine.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params)]
+
+
+ROUTE_QUERIES = {
+    # jobs.employee_dashboard
+    'dashboard_recent_jobs': select(Job).where(Job.status == 'active')
+                                        .order_by(Job.created_at.desc()).limit(5),
+    'dashboard_my_applications': select(Application).where(Application.user_id == 1)
+                                                    .order_by(Application.applied_at.desc()).limit(5),
+    # jobs.job_list
+    'job_list': select(Job).where(Job.status == 'active')
+                           .order_by(Job.created_at.desc(), Job.id.desc()).limit(21),
+    'job_list_after_cursor': select(Job).where(Job.status == 'active',
+                                               tuple_(Job.created_at, Job.id) < (NOW, 100))
+                                        .order_by(Job.created_at.desc(), Job.id.desc()).limit(21),
+    # applications.apply and jobs.job_detail
+    'existing_application': select(Application).where(Application.job_id == 1, Application.user_id == 1).limit(1),
+    # applications.my_applications
+    'my_applications': select(Application).where(Application.user_id == 1)
+                                          .order_by(Application.applied_at.desc(), Application.id.desc())
+                                          .limit(21),
+    # applications.manage_applications filtered by status
+    'manage_applications': select(Application).where(Application.status == 'submitted')
+                                              .order_by(Application.applied_at.desc(), Application.id.desc())
+                                              .limit(21),
+    # interviews.interview_list for HR, filtered by status
+    'interview_list': select(Interview).where(Interview.status == 'scheduled')
+                                       .order_by(Interview.scheduled_date.asc(), Interview.id.asc()).limit(21),
+    # interviews.interview_list for a candidate
+    'my_interviews': select(Interview).join(Application, Interview.application_id == Application.id)
+                                      .where(Application.user_id == 1)
+                                      .order_by(Interview.scheduled_date.asc()),
+}
+
+
+@pytest.mark.parametrize('name', sorted(ROUTE_QUERIES))
+def test_route_query_uses_index(engine, name):
+    plan = query_plan(engine, ROUTE_QUERIES[name])
+    searches = [step for step in plan if step.startswith(('SEARCH', 'SCAN'))]
+    assert searches, plan
+    for step in searches:
+        assert not step.startswith('SCAN'), f'{name}: {plan}'
+        assert 'USING INDEX' in step or 'USING COVERING INDEX' in step \
+            or 'USING INTEGER PRIMARY KEY' in step, f'{name}: {plan}'